@@ -12,7 +12,7 @@ from datetime import datetime
 from pathlib import Path
 from tabulate import tabulate
 
-from src.utils.helpers import load_config, ensure_dir_exists
+from src.utils.helpers import load_config, ensure_dir_exists, categorize_columns
 from src.parsers.apache_parser import ApacheLogParser
 from src.analyzers.performance import PerformanceAnalyzer
 from src.analyzers.security import SecurityAnalyzer
@@ -78,7 +78,7 @@ def analyze_logs(log_file, config):
         print(f"\nSuccessfully parsed {len(parsed_logs)} log entries.")
         
         # Convert to DataFrame
-        logs_df = pd.DataFrame(parsed_logs)
+        logs_df = categorize_columns(pd.DataFrame(parsed_logs))
         
         # Run analyses
         results = {
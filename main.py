@@ -14,7 +14,7 @@ from datetime import datetime
 
 import pandas as pd
 
-from src.utils.helpers import load_config, ensure_dir_exists, get_log_files
+from src.utils.helpers import load_config, ensure_dir_exists, get_log_files, categorize_columns, iter_lines
 from src.parsers.apache_parser import ApacheLogParser
 from src.analyzers.performance import PerformanceAnalyzer
 from src.analyzers.security import SecurityAnalyzer
@@ -113,6 +113,9 @@ def main():
         log_files = get_log_files(log_dir)
         logger.info(f"Found {len(log_files)} log files to process")
         
+        # Response time digest merged across all files (requires crick)
+        response_digest = None
+        
         # Process each log file
         for log_file in log_files:
             logger.info(f"Processing {log_file}")
@@ -124,29 +127,29 @@ def main():
                 continue
             
             logger.info(f"Detected format: {log_format}")
+            apache_parser.specialize(log_format)
             
             # Parse log file
             parsed_logs = []
             error_logs = []
             
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                for i, line in enumerate(f):
-                    try:
-                        if log_format == 'error':
-                            parsed = apache_parser.parse_line(line.strip(), log_type='error')
-                            if parsed:
-                                error_logs.append(parsed)
-                        else:
-                            parsed = apache_parser.parse_line(line.strip(), log_type='access')
-                            if parsed:
-                                parsed_logs.append(parsed)
-                    except Exception as e:
-                        logger.error(f"Error parsing line {i+1}: {str(e)}")
-                        continue
+            for i, line in enumerate(iter_lines(log_file, encoding='utf-8', errors='ignore')):
+                try:
+                    if log_format == 'error':
+                        parsed = apache_parser.parse_line(line.strip(), log_type='error')
+                        if parsed:
+                            error_logs.append(parsed)
+                    else:
+                        parsed = apache_parser.parse_line(line.strip(), log_type='access')
+                        if parsed:
+                            parsed_logs.append(parsed)
+                except Exception as e:
+                    logger.error(f"Error parsing line {i+1}: {str(e)}")
+                    continue
             
             # Convert to DataFrames
             if parsed_logs:
-                access_df = pd.DataFrame(parsed_logs)
+                access_df = categorize_columns(pd.DataFrame(parsed_logs))
                 logger.info(f"Parsed {len(access_df)} access log entries")
                 
                 # Store in database if enabled
@@ -155,6 +158,14 @@ def main():
                 
                 # Analyze performance
                 perf_results = perf_analyzer.generate_performance_report(access_df)
+                
+                # Fold this file's response times into the overall digest
+                digest = perf_analyzer.build_response_time_digest(access_df)
+                if digest is not None:
+                    if response_digest is None:
+                        response_digest = digest
+                    else:
+                        response_digest.merge(digest)
                 logger.info(f"Performance analysis completed: {len(perf_results['issues_detected'])} issues detected")
                 
                 # Store performance metrics if enabled
@@ -177,6 +188,10 @@ def main():
                 if db:
                     db.store_error_logs(error_logs, source_file=log_file.name)
         
+        if response_digest is not None:
+            logger.info(f"Response time percentiles across all files - "
+                        f"95th: {response_digest.quantile(0.95):.3f}s, 99th: {response_digest.quantile(0.99):.3f}s")
+        
         # Clean up
         if db:
             db.close()
@@ -6,6 +6,12 @@ import numpy as np
 import pandas as pd
 from datetime import datetime
 
+try:
+    # Optional: mergeable streaming quantile sketch for large log volumes
+    from crick import TDigest
+except ImportError:
+    TDigest = None
+
 logger = logging.getLogger(__name__)
 
 class PerformanceAnalyzer:
@@ -25,12 +31,35 @@ class PerformanceAnalyzer:
         self.thresholds = config['performance_thresholds']
         logger.debug("Performance analyzer initialized")
     
-    def analyze_response_times(self, logs_df):
+    def _group_by_endpoint(self, logs_df):
+        """
+        Group the columns used by the per-endpoint analyses in a single pass.
+        
+        Args:
+            logs_df (pandas.DataFrame): DataFrame containing parsed logs
+            
+        Returns:
+            pandas.core.groupby.DataFrameGroupBy: Grouping of 'response_time' and a boolean
+            'is_error' column by endpoint, or None if there is no endpoint data
+        """
+        if logs_df.empty or 'endpoint' not in logs_df.columns:
+            return None
+        
+        columns = {'endpoint': logs_df['endpoint']}
+        if 'response_time' in logs_df.columns:
+            columns['response_time'] = logs_df['response_time']
+        if 'status' in logs_df.columns:
+            columns['is_error'] = logs_df['status'] >= 400
+        
+        return pd.DataFrame(columns).groupby('endpoint', observed=True)
+    
+    def analyze_response_times(self, logs_df, grouped=None):
         """
         Analyze response times from parsed logs.
         
         Args:
             logs_df (pandas.DataFrame): DataFrame containing parsed logs
+            grouped (DataFrameGroupBy, optional): Precomputed grouping from _group_by_endpoint
             
         Returns:
             dict: Performance metrics and identified issues
@@ -43,30 +72,35 @@ class PerformanceAnalyzer:
                 'performance_metrics': []
             }
         
-        # Calculate overall statistics
+        # Calculate overall statistics from one column lookup and one quantile pass
+        response_times = logs_df['response_time']
+        median, p95, p99 = response_times.quantile([0.5, 0.95, 0.99]).to_numpy()
         stats = {
-            'mean': logs_df['response_time'].mean(),
-            'median': logs_df['response_time'].median(),
-            'p95': logs_df['response_time'].quantile(0.95),
-            'p99': logs_df['response_time'].quantile(0.99),
-            'max': logs_df['response_time'].max()
+            'mean': response_times.mean(),
+            'median': median,
+            'p95': p95,
+            'p99': p99,
+            'max': response_times.max()
         }
         
         logger.info(f"Overall response time stats - Mean: {stats['mean']:.3f}s, "
                    f"95th percentile: {stats['p95']:.3f}s, Max: {stats['max']:.3f}s")
         
         # Analyze by endpoint
-        if 'endpoint' in logs_df.columns:
-            endpoint_stats = logs_df.groupby('endpoint').agg({
-                'response_time': ['count', 'mean', 'median', 'max', 
-                                 lambda x: np.percentile(x, 95) if len(x) > 0 else 0],
-                'status': [lambda x: (x >= 400).sum() / len(x) if len(x) > 0 else 0]
-            })
+        if grouped is None:
+            grouped = self._group_by_endpoint(logs_df)
+        
+        if grouped is not None:
+            endpoint_stats = grouped['response_time'].agg(['count', 'mean', 'median', 'max'])
             
             # Flatten the column hierarchy
-            endpoint_stats.columns = [
-                'count', 'mean_time', 'median_time', 'max_time', 'p95_time', 'error_rate'
-            ]
+            endpoint_stats.columns = ['count', 'mean_time', 'median_time', 'max_time']
+            
+            # Grouped quantile runs in compiled code instead of calling back into Python per endpoint
+            endpoint_stats['p95_time'] = grouped['response_time'].quantile(0.95)
+            endpoint_stats['error_rate'] = (
+                grouped['is_error'].mean() if 'is_error' in grouped.obj.columns else 0.0
+            )
             
             # Identify slow endpoints
             slow_endpoints = endpoint_stats[
@@ -77,16 +111,17 @@ class PerformanceAnalyzer:
             performance_metrics = []
             current_time = datetime.now().isoformat()
             
-            for endpoint, row in endpoint_stats.iterrows():
+            metric_rows = endpoint_stats[['count', 'mean_time', 'p95_time', 'error_rate']].itertuples(name=None)
+            for endpoint, count, mean_time, p95_time, error_rate in metric_rows:
                 # Skip endpoints with very few requests
-                if row['count'] < 5:
+                if count < 5:
                     continue
                     
                 # Add overall response time metrics
                 performance_metrics.append({
                     'timestamp': current_time,
                     'metric_name': 'mean_response_time',
-                    'metric_value': row['mean_time'],
+                    'metric_value': mean_time,
                     'endpoint': endpoint,
                     'time_window': 3600  # assume 1-hour window for this example
                 })
@@ -94,7 +129,7 @@ class PerformanceAnalyzer:
                 performance_metrics.append({
                     'timestamp': current_time,
                     'metric_name': 'p95_response_time',
-                    'metric_value': row['p95_time'],
+                    'metric_value': p95_time,
                     'endpoint': endpoint,
                     'time_window': 3600
                 })
@@ -103,14 +138,14 @@ class PerformanceAnalyzer:
                 performance_metrics.append({
                     'timestamp': current_time,
                     'metric_name': 'error_rate',
-                    'metric_value': row['error_rate'],
+                    'metric_value': error_rate,
                     'endpoint': endpoint,
                     'time_window': 3600
                 })
             
             return {
                 'overall_stats': stats,
-                'slow_endpoints': slow_endpoints.to_dict(),
+                'slow_endpoints': slow_endpoints.to_dict(orient='index'),
                 'performance_metrics': performance_metrics
             }
         else:
@@ -121,12 +156,37 @@ class PerformanceAnalyzer:
                 'performance_metrics': []
             }
     
-    def analyze_status_codes(self, logs_df):
+    def build_response_time_digest(self, logs_df):
+        """
+        Build a t-digest sketch of response times.
+        
+        Percentiles of a single DataFrame are computed exactly by
+        analyze_response_times. Digests are for percentiles across several
+        files: digests built per file can be combined with
+        ``digest.merge(other)`` without keeping every file's logs in memory.
+        
+        Args:
+            logs_df (pandas.DataFrame): DataFrame containing parsed logs
+            
+        Returns:
+            crick.TDigest: Response time digest, or None if crick is not installed
+        """
+        if TDigest is None or logs_df.empty or 'response_time' not in logs_df.columns:
+            return None
+        
+        # Relative quantile error is roughly 1 / compression
+        percentile_error = self.thresholds.get('percentile_error', 0.01)
+        digest = TDigest(compression=max(20, int(1 / percentile_error)))
+        digest.update(logs_df['response_time'].to_numpy(dtype=np.float64))
+        return digest
+    
+    def analyze_status_codes(self, logs_df, grouped=None):
         """
         Analyze HTTP status codes to identify error patterns.
         
         Args:
             logs_df (pandas.DataFrame): DataFrame containing parsed logs
+            grouped (DataFrameGroupBy, optional): Precomputed grouping from _group_by_endpoint
             
         Returns:
             dict: Status code analysis and error patterns
@@ -140,11 +200,12 @@ class PerformanceAnalyzer:
             }
         
         # Count status codes
-        status_counts = logs_df['status'].value_counts().to_dict()
+        status = logs_df['status']
+        status_counts = status.value_counts().to_dict()
         
         # Calculate error rate
         total_requests = len(logs_df)
-        error_count = sum(logs_df['status'] >= 400)
+        error_count = int((status.to_numpy() >= 400).sum())
         error_rate = error_count / total_requests if total_requests > 0 else 0
         
         logger.info(f"Status code distribution: {status_counts}")
@@ -156,21 +217,21 @@ class PerformanceAnalyzer:
         
         # Analyze errors by endpoint if possible
         error_endpoints = {}
-        if 'endpoint' in logs_df.columns:
-            error_df = logs_df[logs_df['status'] >= 400]
+        if grouped is None:
+            grouped = self._group_by_endpoint(logs_df)
+        
+        if grouped is not None and error_count > 0:
+            endpoint_counts = grouped['is_error'].agg(['sum', 'size'])
+            endpoint_counts = endpoint_counts[endpoint_counts['sum'] > 0]
             
-            if not error_df.empty:
-                error_by_endpoint = error_df.groupby('endpoint').size()
-                total_by_endpoint = logs_df.groupby('endpoint').size()
-                
-                for endpoint in error_by_endpoint.index:
-                    errors = error_by_endpoint[endpoint]
-                    total = total_by_endpoint[endpoint]
-                    error_endpoints[endpoint] = {
-                        'error_count': int(errors),
-                        'total_count': int(total),
-                        'error_rate': float(errors / total)
-                    }
+            for endpoint, errors, total in zip(endpoint_counts.index,
+                                               endpoint_counts['sum'],
+                                               endpoint_counts['size']):
+                error_endpoints[endpoint] = {
+                    'error_count': int(errors),
+                    'total_count': int(total),
+                    'error_rate': float(errors / total)
+                }
         
         return {
             'status_counts': status_counts,
@@ -227,6 +288,22 @@ class PerformanceAnalyzer:
                 'peak_times': []
             }
     
+    def _analyze_all(self, logs_df):
+        """
+        Run the response time and status code analyses over one shared endpoint grouping.
+        
+        Args:
+            logs_df (pandas.DataFrame): DataFrame containing parsed logs
+            
+        Returns:
+            tuple: (response time analysis, status code analysis)
+        """
+        grouped = self._group_by_endpoint(logs_df)
+        return (
+            self.analyze_response_times(logs_df, grouped),
+            self.analyze_status_codes(logs_df, grouped)
+        )
+    
     def generate_performance_report(self, logs_df):
         """
         Generate a comprehensive performance report.
@@ -239,8 +316,7 @@ class PerformanceAnalyzer:
         """
         logger.info("Generating comprehensive performance report")
         
-        response_time_analysis = self.analyze_response_times(logs_df)
-        status_code_analysis = self.analyze_status_codes(logs_df)
+        response_time_analysis, status_code_analysis = self._analyze_all(logs_df)
         
         try:
             traffic_analysis = self.analyze_traffic_patterns(logs_df)
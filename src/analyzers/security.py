@@ -3,12 +3,68 @@ Security analyzer for the Log Analysis & Monitoring System.
 """
 import re
 import logging
+import ipaddress
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from collections import Counter
 
+try:
+    # Optional: multi-pattern DFA matcher for production-scale log volumes
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
+# Leading global inline flags such as (?i), which must become scoped groups inside an alternation
+_GLOBAL_FLAGS = re.compile(r'\(\?([aiLmsux]+)\)')
+
+# Backreferences, whose group numbers would shift inside an alternation
+_BACKREF = re.compile(r'\\[1-9]|\(\?P=')
+
+def _ip_to_u32(ip):
+    """
+    Pack a dotted-quad IPv4 address into an unsigned 32-bit integer.
+    
+    Only strict dotted quads are accepted; shorthand such as ``127.1``,
+    octal-looking ``010.0.0.1`` and trailing text are rejected rather than
+    reinterpreted as a different address.
+    
+    Args:
+        ip (str): IPv4 address
+        
+    Returns:
+        int: Packed address, or None if the value is not an IPv4 address
+    """
+    try:
+        return int(ipaddress.IPv4Address(ip))
+    except (ValueError, TypeError):
+        return None
+
+def _pack_ip_column(ip_series):
+    """
+    Pack an IP address column into uint32 values.
+    
+    Each distinct address is converted once and broadcast back to the rows.
+    
+    Args:
+        ip_series (pandas.Series): Column of IP address strings
+        
+    Returns:
+        tuple: (numpy.ndarray of uint32 addresses, numpy.ndarray bool mask of valid IPv4 rows)
+    """
+    codes, uniques = pd.factorize(ip_series)
+    packed = [_ip_to_u32(ip) for ip in uniques]
+    unique_valid = np.array([value is not None for value in packed] + [False], dtype=bool)
+    unique_u32 = np.array([value or 0 for value in packed] + [0], dtype=np.uint32)
+    # factorize marks missing values with -1, which picks the trailing invalid slot
+    return unique_u32[codes], unique_valid[codes]
+
+def _collect_hyperscan_match(pattern_id, start, end, flags, matched):
+    """Hyperscan match callback that records the id of each matching pattern."""
+    matched.append(pattern_id)
+
 class SecurityAnalyzer:
     """
     Analyzes logs for security threats and suspicious activities.
@@ -26,6 +82,15 @@ class SecurityAnalyzer:
         self.attack_patterns = self._compile_patterns(config['security']['attack_patterns'])
         self.scan_patterns = self._compile_patterns(config['security']['scan_patterns'])
         self.suspicious_ips = self._load_suspicious_ips(config['security'].get('suspicious_ips_file'))
+        self.suspicious_nets, self.suspicious_literals = self._compile_ip_networks(self.suspicious_ips)
+        
+        # Hyperscan databases scan all patterns in one pass; None means use the regex fallback
+        self.attack_db = self._compile_hyperscan_db(self.attack_patterns)
+        self.scan_db = self._compile_hyperscan_db(self.scan_patterns)
+        
+        # Single-pass prefilters for the regex fallback; None means test each pattern in turn
+        self.attack_union = self._compile_union(self.attack_patterns)
+        self.scan_union = self._compile_union(self.scan_patterns)
         
         logger.debug("Security analyzer initialized")
         
@@ -47,6 +112,133 @@ class SecurityAnalyzer:
                 logger.error(f"Invalid regex pattern '{pattern}': {str(e)}")
         return compiled
     
+    def _compile_union(self, patterns):
+        """
+        Fuse compiled patterns into one alternation that tells whether any of them matches.
+        
+        Args:
+            patterns (list): Compiled regex patterns
+            
+        Returns:
+            re.Pattern: Combined pattern, or None if the patterns cannot be combined
+        """
+        if len(patterns) < 2:
+            return None
+        
+        alternatives = []
+        for pattern in patterns:
+            source = pattern.pattern
+            if _BACKREF.search(source):
+                return None
+            flags = _GLOBAL_FLAGS.match(source)
+            if flags:
+                alternatives.append(f'(?{flags.group(1)}:{source[flags.end():]})')
+            else:
+                alternatives.append(f'(?:{source})')
+        
+        try:
+            return re.compile('|'.join(alternatives), re.IGNORECASE)
+        except re.error as e:
+            logger.debug(f"Patterns cannot be combined, testing them one at a time: {str(e)}")
+            return None
+    
+    def _compile_hyperscan_db(self, patterns):
+        """
+        Compile regex patterns into a Hyperscan block-mode database.
+        
+        Args:
+            patterns (list): Compiled regex patterns
+            
+        Returns:
+            hyperscan.Database: Compiled database, or None if Hyperscan is unavailable
+        """
+        if hyperscan is None or not patterns:
+            return None
+        
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[pattern.pattern.encode('utf-8') for pattern in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+            )
+            return db
+        except hyperscan.error as e:
+            logger.warning(f"Hyperscan could not compile patterns, using regex fallback: {str(e)}")
+            return None
+    
+    def _first_match(self, endpoint, patterns, db, union=None):
+        """
+        Find the first pattern, in configuration order, that matches an endpoint.
+        
+        Args:
+            endpoint (str): Request endpoint to check
+            patterns (list): Compiled regex patterns
+            db (hyperscan.Database): Hyperscan database for the patterns, or None
+            union (re.Pattern, optional): Alternation of the patterns from _compile_union
+            
+        Returns:
+            re.Pattern: First matching pattern or None
+        """
+        if db is not None:
+            matched = []
+            db.scan(endpoint.encode('utf-8', 'replace'),
+                    match_event_handler=_collect_hyperscan_match, context=matched)
+            return patterns[min(matched)] if matched else None
+        
+        # Most endpoints match nothing; rule them out with one search instead of one per pattern
+        if union is not None and not union.search(endpoint):
+            return None
+        
+        for pattern in patterns:
+            if pattern.search(endpoint):
+                return pattern
+        return None
+    
+    def _match_endpoints(self, endpoints, patterns, db, union=None):
+        """
+        Find the rows whose endpoint matches a pattern, testing each distinct endpoint once.
+        
+        Args:
+            endpoints (pandas.Series): Endpoint column of the logs
+            patterns (list): Compiled regex patterns
+            db (hyperscan.Database): Hyperscan database for the patterns, or None
+            union (re.Pattern, optional): Alternation of the patterns from _compile_union
+            
+        Returns:
+            tuple: (numpy.ndarray of matching row positions, numpy.ndarray of their first matching patterns)
+        """
+        codes, uniques = pd.factorize(endpoints)
+        
+        # Trailing slot stays None for rows with a missing endpoint (code -1)
+        matches = np.full(len(uniques) + 1, None, dtype=object)
+        for i, endpoint in enumerate(uniques):
+            matches[i] = self._first_match(endpoint, patterns, db, union)
+        
+        row_matches = matches[codes]
+        hit_rows = np.flatnonzero(pd.notna(row_matches))
+        return hit_rows, row_matches[hit_rows]
+    
+    def _event_rows(self, logs_df, rows, current_time):
+        """
+        Iterate over the fields of the given rows that security events report.
+        
+        Args:
+            logs_df (pandas.DataFrame): DataFrame containing parsed logs
+            rows (numpy.ndarray): Row positions to iterate over
+            current_time (str): Timestamp used when the logs have none
+            
+        Returns:
+            iterator: (timestamp, ip_address, endpoint) tuples
+        """
+        hits = logs_df.iloc[rows]
+        defaults = {'timestamp': current_time, 'ip_address': 'unknown'}
+        missing = {column: value for column, value in defaults.items() if column not in hits.columns}
+        if missing:
+            hits = hits.assign(**missing)
+        return hits[['timestamp', 'ip_address', 'endpoint']].itertuples(index=False, name=None)
+    
     def _load_suspicious_ips(self, file_path):
         """
         Load list of known suspicious IPs from a file.
@@ -81,6 +273,41 @@ class SecurityAnalyzer:
         
         return suspicious_ips
     
+    def _compile_ip_networks(self, entries):
+        """
+        Group suspicious IPs and CIDR subnets by netmask for vectorized lookups.
+        
+        Args:
+            entries (set): IPv4 addresses or CIDR subnets such as 10.0.0.0/8
+            
+        Returns:
+            tuple: (list of (netmask, numpy.ndarray of network addresses) pairs,
+                    set of IPv6 addresses that are matched literally)
+        """
+        nets_by_mask = {}
+        literals = set()
+        for entry in entries:
+            try:
+                network = ipaddress.ip_network(entry, strict=False)
+            except (ValueError, TypeError):
+                logger.warning(f"Ignoring invalid suspicious IP entry: {entry}")
+                continue
+            if network.version != 4:
+                if '/' in entry:
+                    logger.warning(f"Ignoring unsupported IPv6 subnet entry: {entry}")
+                else:
+                    # IPv6 addresses fall back to exact string matches
+                    literals.add(entry)
+                continue
+            mask = int(network.netmask)
+            nets_by_mask.setdefault(mask, set()).add(int(network.network_address))
+        
+        networks = [
+            (np.uint32(mask), np.fromiter(nets, dtype=np.uint32, count=len(nets)))
+            for mask, nets in nets_by_mask.items()
+        ]
+        return networks, literals
+    
     def analyze_logs(self, logs_df):
         """
         Analyze logs for security threats.
@@ -153,24 +380,22 @@ class SecurityAnalyzer:
         if 'endpoint' not in logs_df.columns:
             return events
         
-        # Check each endpoint for attack patterns
-        for idx, row in logs_df.iterrows():
-            endpoint = row['endpoint']
-            ip_address = row.get('ip_address', 'unknown')
-            
-            for pattern in self.attack_patterns:
-                if pattern.search(endpoint):
-                    pattern_str = pattern.pattern
-                    events.append({
-                        'timestamp': row.get('timestamp', current_time),
-                        'event_type': 'attack_pattern',
-                        'severity': 'high',
-                        'ip_address': ip_address,
-                        'endpoint': endpoint,
-                        'description': f"Potential attack pattern detected: {pattern_str}"
-                    })
-                    logger.warning(f"Attack pattern detected from {ip_address}: {pattern_str} in {endpoint}")
-                    break  # Only report one pattern per request
+        # Check each distinct endpoint once; only report one pattern per request
+        hit_rows, hit_patterns = self._match_endpoints(
+            logs_df['endpoint'], self.attack_patterns, self.attack_db, self.attack_union)
+        
+        for (timestamp, ip_address, endpoint), pattern in zip(
+                self._event_rows(logs_df, hit_rows, current_time), hit_patterns):
+            pattern_str = pattern.pattern
+            events.append({
+                'timestamp': timestamp,
+                'event_type': 'attack_pattern',
+                'severity': 'high',
+                'ip_address': ip_address,
+                'endpoint': endpoint,
+                'description': f"Potential attack pattern detected: {pattern_str}"
+            })
+            logger.warning(f"Attack pattern detected from {ip_address}: {pattern_str} in {endpoint}")
         
         return events
     
@@ -191,24 +416,22 @@ class SecurityAnalyzer:
         if 'endpoint' not in logs_df.columns:
             return events
         
-        # Check each endpoint for scan patterns
-        for idx, row in logs_df.iterrows():
-            endpoint = row['endpoint']
-            ip_address = row.get('ip_address', 'unknown')
-            
-            for pattern in self.scan_patterns:
-                if pattern.search(endpoint):
-                    pattern_str = pattern.pattern
-                    events.append({
-                        'timestamp': row.get('timestamp', current_time),
-                        'event_type': 'scan_attempt',
-                        'severity': 'medium',
-                        'ip_address': ip_address,
-                        'endpoint': endpoint,
-                        'description': f"Potential scanning attempt detected: {pattern_str}"
-                    })
-                    logger.warning(f"Scan attempt detected from {ip_address}: {pattern_str} in {endpoint}")
-                    break  # Only report one pattern per request
+        # Check each distinct endpoint once; only report one pattern per request
+        hit_rows, hit_patterns = self._match_endpoints(
+            logs_df['endpoint'], self.scan_patterns, self.scan_db, self.scan_union)
+        
+        for (timestamp, ip_address, endpoint), pattern in zip(
+                self._event_rows(logs_df, hit_rows, current_time), hit_patterns):
+            pattern_str = pattern.pattern
+            events.append({
+                'timestamp': timestamp,
+                'event_type': 'scan_attempt',
+                'severity': 'medium',
+                'ip_address': ip_address,
+                'endpoint': endpoint,
+                'description': f"Potential scanning attempt detected: {pattern_str}"
+            })
+            logger.warning(f"Scan attempt detected from {ip_address}: {pattern_str} in {endpoint}")
         
         return events
     
@@ -228,21 +451,32 @@ class SecurityAnalyzer:
         if not self.suspicious_ips or 'ip_address' not in logs_df.columns:
             return events
         
-        # Group by IP to avoid duplicate events
-        ip_groups = logs_df.groupby('ip_address')
+        # Compare packed addresses against every blocked network, one netmask at a time
+        ip_u32, valid = _pack_ip_column(logs_df['ip_address'])
+        flagged = np.zeros(len(logs_df), dtype=bool)
+        for mask, nets in self.suspicious_nets:
+            flagged |= np.isin(ip_u32 & mask, nets)
+        flagged &= valid
+        if self.suspicious_literals:
+            flagged |= logs_df['ip_address'].isin(self.suspicious_literals).to_numpy()
+        
+        if not flagged.any():
+            return events
+        
+        # Group the flagged rows by IP to avoid duplicate events
+        ip_groups = logs_df[flagged].groupby('ip_address', observed=True)
         
         for ip, group in ip_groups:
-            if ip in self.suspicious_ips:
-                first_row = group.iloc[0]
-                events.append({
-                    'timestamp': first_row.get('timestamp', datetime.now().isoformat()),
-                    'event_type': 'suspicious_ip',
-                    'severity': 'high',
-                    'ip_address': ip,
-                    'endpoint': first_row.get('endpoint', 'unknown'),
-                    'description': f"Activity from known suspicious IP: {ip} ({len(group)} requests)"
-                })
-                logger.warning(f"Activity from known suspicious IP: {ip} ({len(group)} requests)")
+            first_row = group.iloc[0]
+            events.append({
+                'timestamp': first_row.get('timestamp', datetime.now().isoformat()),
+                'event_type': 'suspicious_ip',
+                'severity': 'high',
+                'ip_address': ip,
+                'endpoint': first_row.get('endpoint', 'unknown'),
+                'description': f"Activity from known suspicious IP: {ip} ({len(group)} requests)"
+            })
+            logger.warning(f"Activity from known suspicious IP: {ip} ({len(group)} requests)")
         
         return events
     
@@ -273,7 +507,7 @@ class SecurityAnalyzer:
             return events
         
         # Count failed attempts by IP
-        ip_counts = login_attempts.groupby('ip_address').size()
+        ip_counts = login_attempts.groupby('ip_address', observed=True).size()
         
         # Report IPs with excessive failed attempts
         threshold = 5  # Consider configurable
@@ -312,7 +546,7 @@ class SecurityAnalyzer:
         dangerous_methods = {'PUT', 'DELETE', 'TRACE', 'CONNECT', 'OPTIONS'}
         
         # Group by method and IP
-        method_groups = logs_df.groupby(['method', 'ip_address'])
+        method_groups = logs_df.groupby(['method', 'ip_address'], observed=True)
         
         for (method, ip), group in method_groups:
             if method not in common_methods and method in dangerous_methods:
@@ -1,30 +1,381 @@
 """
 Apache log parser for the Log Analysis & Monitoring System.
 """
+import os
 import re
 import logging
+import multiprocessing
+import pandas as pd
+from collections import OrderedDict
 from datetime import datetime
-from ..utils.helpers import load_patterns
+from functools import lru_cache
+from ..utils.helpers import load_patterns, iter_lines
+
+try:
+    # Optional: linear-time DFA regex engine for the line patterns
+    import re2
+except ImportError:
+    re2 = None
 
 logger = logging.getLogger(__name__)
 
+# Number of (path, mtime, size) format detections kept per parser
+_FORMAT_CACHE_MAX = 128
+
+# Number of recently parsed access lines kept per parser
+_LINE_CACHE_MAX = 4096
+
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+_WEEKDAYS = frozenset(('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'))
+
+def _parse_apache_ts(value):
+    """
+    Parse an access log timestamp such as ``10/Oct/2023:13:55:36 -0700``.
+    
+    Fields are sliced at their fixed offsets instead of interpreting a
+    strptime format string. The timezone offset is dropped, matching the
+    naive local timestamps used throughout the system.
+    
+    Args:
+        value (str): Timestamp text from between the square brackets
+        
+    Returns:
+        datetime: Parsed timestamp, or None if the text is not in the padded layout
+    """
+    if (len(value) < 20 or value[2] != '/' or value[6] != '/' or value[11] != ':'
+            or value[14] != ':' or value[17] != ':' or (len(value) > 20 and value[20] != ' ')):
+        return None
+    
+    month = _MONTHS.get(value[3:6])
+    if month is None:
+        return None
+    
+    # int() would also accept spaces, underscores and signs inside the fields
+    day, year, hour, minute, second = value[0:2], value[7:11], value[12:14], value[15:17], value[18:20]
+    digits = day + year + hour + minute + second
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    
+    try:
+        return datetime(int(year), month, int(day), int(hour), int(minute), int(second))
+    except ValueError:
+        return None
+
+def _parse_apache_error_ts(value):
+    """
+    Parse an error log timestamp such as ``Wed Oct 11 14:32:52 2023``.
+    
+    Like _parse_apache_ts, the fields are sliced at their fixed offsets and
+    passed straight to the datetime constructor.
+    
+    Args:
+        value (str): Timestamp text from between the square brackets
+        
+    Returns:
+        datetime: Parsed timestamp, or None if the text is not in the padded layout
+    """
+    if (len(value) != 24 or value[3] != ' ' or value[7] != ' ' or value[10] != ' '
+            or value[13] != ':' or value[16] != ':' or value[19] != ' '
+            or value[0:3] not in _WEEKDAYS):
+        return None
+    
+    month = _MONTHS.get(value[4:7])
+    if month is None:
+        return None
+    
+    # Only the day may be space-padded; int() would also accept spaces,
+    # underscores and signs inside the other fields
+    day, hour, minute, second, year = value[8:10], value[11:13], value[14:16], value[17:19], value[20:24]
+    digits = (day[1] if day[0] == ' ' else day) + hour + minute + second + year
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    
+    try:
+        return datetime(int(year), month, int(day), int(hour), int(minute), int(second))
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=8192)
+def _cached_ts(value):
+    """
+    Parse an access log timestamp, memoized on the raw text.
+    
+    Busy servers write many lines per second, so the same timestamp text
+    repeats across consecutive lines.
+    
+    Args:
+        value (str): Timestamp text from between the square brackets
+        
+    Returns:
+        datetime: Parsed timestamp, or None if it could not be parsed
+    """
+    timestamp = _parse_apache_ts(value)
+    if timestamp is None:
+        try:
+            # Common Apache timestamp format: 10/Oct/2023:13:55:36 -0700
+            timestamp = datetime.strptime(
+                value.split()[0],  # Remove timezone
+                '%d/%b/%Y:%H:%M:%S'
+            )
+        except ValueError:
+            return None
+    return timestamp
+
+@lru_cache(maxsize=8192)
+def _cached_error_ts(value):
+    """
+    Parse an error log timestamp such as ``Wed Oct 11 14:32:52 2023``, memoized on the raw text.
+    
+    Args:
+        value (str): Timestamp text from between the square brackets
+        
+    Returns:
+        datetime: Parsed timestamp, or None if it could not be parsed
+    """
+    timestamp = _parse_apache_error_ts(value)
+    if timestamp is None:
+        try:
+            timestamp = datetime.strptime(value, '%a %b %d %H:%M:%S %Y')
+        except ValueError:
+            return None
+    return timestamp
+
+def _parse_access_fast(line):
+    """
+    Split a well-formed access log line into its raw fields without regexes.
+    
+    The line is cut on its double quotes, which separates the prefix,
+    request, status/bytes, referer and user agent, then each piece is
+    split on spaces. Anything outside the strict common, combined and
+    combined-with-time layouts returns None so the caller can fall back
+    to the regex patterns.
+    
+    Args:
+        line (str): The log line to parse
+        
+    Returns:
+        tuple: (format name, dict of raw string fields), or None
+    """
+    segments = line.split('"')
+    count = len(segments)
+    if count != 3 and count != 7:
+        return None
+    
+    # ip ident user [timestamp]
+    prefix = segments[0]
+    parts = prefix.split(' ', 3)
+    if len(parts) != 4:
+        return None
+    ip_address, ident, user, stamp = parts
+    timestamp = stamp[1:-2]
+    if (not (ip_address and ident and user and timestamp) or stamp[0] != '['
+            or stamp[-2:] != '] ' or ']' in timestamp or not prefix.isprintable()):
+        return None
+    
+    # METHOD endpoint protocol
+    request = segments[1].split(' ', 2)
+    if len(request) != 3:
+        return None
+    method, endpoint, protocol = request
+    if not (endpoint and protocol and method.isascii() and method.isalpha() and method.isupper()):
+        return None
+    
+    # status bytes_sent, followed by a space when referer and user agent come next
+    fields = segments[2].split(' ')
+    if len(fields) != (3 if count == 3 else 4) or fields[0]:
+        return None
+    status, bytes_sent = fields[1], fields[2]
+    if not status.isdecimal() or not (bytes_sent == '-' or bytes_sent.isdecimal()):
+        return None
+    
+    data = {
+        'ip_address': ip_address,
+        'timestamp': timestamp,
+        'method': method,
+        'endpoint': endpoint,
+        'protocol': protocol,
+        'status': status,
+        'bytes_sent': bytes_sent
+    }
+    if count == 3:
+        return 'common', data
+    
+    # "referer" "user_agent" and an optional trailing response time
+    if fields[3] or segments[4] != ' ':
+        return None
+    data['referer'] = segments[3]
+    data['user_agent'] = segments[5]
+    
+    after = segments[6]
+    if not after:
+        return 'combined', data
+    whole, dot, fraction = after[1:].partition('.')
+    if after[0] == ' ' and dot and whole.isdecimal() and fraction.isdecimal():
+        data['response_time'] = after[1:]
+        return 'combined_time', data
+    return None
+
+def _bytes_sent(value):
+    """Convert a raw bytes_sent field, where '-' means no body, to an int."""
+    return 0 if value == '-' else int(value)
+
+def _convert_distinct(values, convert):
+    """
+    Convert a column of raw strings by converting each distinct value once.
+    
+    Args:
+        values (pandas.Series): Raw string values
+        convert (callable): Conversion applied to a single value
+        
+    Returns:
+        list: Converted values in the original order
+    """
+    codes, uniques = pd.factorize(values)
+    converted = [convert(value) for value in uniques]
+    return [converted[code] for code in codes]
+
+def _compile_line_pattern(pattern):
+    """
+    Compile a line pattern with re2 when available, otherwise with re.
+    
+    re2 matches in linear time without backtracking. Patterns using features
+    re2 does not support fall back to the standard library engine.
+    
+    Args:
+        pattern (str): Regular expression for a log line
+        
+    Returns:
+        Compiled pattern exposing match() and groupdict()
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception as e:
+            logger.debug(f"re2 cannot compile pattern, using re instead: {str(e)}")
+    return re.compile(pattern)
+
+@lru_cache(maxsize=None)
+def _compile_apache_patterns(common_log, combined_log, combined_with_time, error_log):
+    """
+    Compile the Apache log patterns once per distinct set of pattern strings.
+    
+    Args:
+        common_log (str): Common Log Format pattern
+        combined_log (str): Combined Log Format pattern
+        combined_with_time (str): Combined Log Format with response time pattern
+        error_log (str): Error log pattern
+        
+    Returns:
+        dict: Compiled patterns keyed by format name
+    """
+    return {
+        'common': _compile_line_pattern(common_log),
+        'combined': _compile_line_pattern(combined_log),
+        'combined_time': _compile_line_pattern(combined_with_time),
+        'error': _compile_line_pattern(error_log)
+    }
+
+def _chunk_offsets(log_file_path, chunks):
+    """
+    Split a file into byte ranges of roughly equal size that end on line boundaries.
+    
+    Args:
+        log_file_path (str): Path to log file
+        chunks (int): Number of ranges to aim for
+        
+    Returns:
+        list: (start, end) byte offsets covering the whole file
+    """
+    with open(log_file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        bounds = [0]
+        for i in range(1, chunks):
+            # Seek and read forward rather than map the file, so a concurrent
+            # truncation just shortens the ranges instead of raising SIGBUS
+            pos = max(size * i // chunks, bounds[-1])
+            f.seek(pos)
+            rest = f.readline()
+            if not rest.endswith(b'\n'):
+                break
+            if pos + len(rest) > bounds[-1]:
+                bounds.append(pos + len(rest))
+    
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _parse_chunk(task):
+    """
+    Parse one byte range of a log file in a worker process.
+    
+    The worker rebuilds a parser with the caller's patterns, line cache
+    setting and specialized format, so its entries match what the caller's
+    parser would return.
+    
+    Args:
+        task (tuple): (log_file_path, start, end, log_type, encoding, errors,
+                       patterns, line_cache, log_format)
+        
+    Returns:
+        list: Parsed log entries of the lines in the range
+    """
+    log_file_path, start, end, log_type, encoding, errors, patterns, line_cache, log_format = task
+    with open(log_file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start).decode(encoding, errors)
+    
+    parser = ApacheLogParser(line_cache=line_cache, patterns=patterns)
+    if log_format is not None:
+        parser.specialize(log_format)
+    entries = []
+    for line in data.split('\n'):
+        entry = parser.parse_line(line.strip(), log_type)
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
 class ApacheLogParser:
     """
     Parser for Apache HTTP Server log files.
     Supports Common Log Format (CLF), Combined Log Format, and custom formats with response time.
     """
     
-    def __init__(self):
-        """Initialize the Apache log parser with regex patterns from configuration."""
-        self.patterns = load_patterns()['apache']
+    def __init__(self, line_cache=False, patterns=None):
+        """
+        Initialize the Apache log parser with regex patterns from configuration.
         
-        # Compile regex patterns for better performance
-        self.compiled_patterns = {
-            'common': re.compile(self.patterns['common_log']),
-            'combined': re.compile(self.patterns['combined_log']),
-            'combined_time': re.compile(self.patterns['combined_with_time']),
-            'error': re.compile(self.patterns['error_log'])
-        }
+        Args:
+            line_cache (bool): Reuse the parsed entries of recently seen identical
+                access lines. This pays off for logs dominated by repeated
+                requests such as health checks and load balancer probes, but
+                slows down parsing when most lines are unique.
+            patterns (dict, optional): Apache patterns to use instead of the configured ones
+        """
+        self.patterns = patterns if patterns is not None else load_patterns()['apache']
+        
+        # Compiled patterns are shared by every parser using the same configuration
+        self.compiled_patterns = dict(_compile_apache_patterns(
+            self.patterns['common_log'],
+            self.patterns['combined_log'],
+            self.patterns['combined_with_time'],
+            self.patterns['error_log']
+        ))
+        
+        # LRU of detected formats keyed by (path, mtime_ns, size)
+        self._format_cache = OrderedDict()
+        
+        # LRU of parsed entries keyed by the exact access log line
+        self._line_cache = OrderedDict()
+        self._line_cache_enabled = line_cache
+        self._specialized_format = None
+        self._parse_access_general = self._parse_access_log_cached if line_cache else self._parse_access_log
+        self._parse_access = self._parse_access_general
         
         logger.debug("Apache log parser initialized")
     
@@ -46,14 +397,162 @@ class ApacheLogParser:
             if log_type == 'error':
                 return self._parse_error_log(line)
             else:
-                return self._parse_access_log(line)
+                return self._parse_access(line)
         except Exception as e:
             logger.error(f"Error parsing Apache log line: {str(e)}")
             logger.debug(f"Problematic line: {line}")
             return None
     
+    def specialize(self, log_format):
+        """
+        Switch access line parsing to a path specialized for one detected format.
+        
+        The specialized path goes straight to the parser for that format
+        without the per-line checks that choose between formats. Lines it
+        cannot handle still go through the general path, so mixed files parse
+        the same, only slower. Any other format, or an enabled line cache,
+        restores the general path.
+        
+        Args:
+            log_format (str): Format returned by detect_format
+        """
+        general = self._parse_access_general
+        convert = self._convert_access_fields
+        
+        if general != self._parse_access_log:
+            parse_access = general
+        elif log_format == 'combined_time':
+            pattern = self.compiled_patterns['combined_time']
+            
+            def parse_access(line):
+                match = pattern.match(line)
+                if match:
+                    return convert(match.groupdict(), 'combined_time')
+                return general(line)
+        elif log_format in ('common', 'combined'):
+            def parse_access(line):
+                fast = _parse_access_fast(line)
+                if fast is not None:
+                    return convert(fast[1], fast[0])
+                return general(line)
+        else:
+            parse_access = general
+        
+        self._parse_access = parse_access
+        self._specialized_format = log_format
+    
+    def parse_file(self, log_file_path, log_type='access', encoding='utf-8', errors='ignore'):
+        """
+        Parse an Apache log file lazily, one entry at a time.
+        
+        Lines are read through a memory map one at a time, so memory use
+        stays constant regardless of the file size. Lines that cannot be
+        parsed are skipped. The default decoding matches the main processing
+        loop, so both produce the same entries for non-ASCII lines.
+        
+        Args:
+            log_file_path (str): Path to log file
+            log_type (str): Type of log - 'access' or 'error'
+            encoding (str): Encoding used to decode each line
+            errors (str): Decoding error handler
+            
+        Yields:
+            dict: Parsed log entries
+        """
+        try:
+            for line in iter_lines(log_file_path, encoding=encoding, errors=errors):
+                entry = self.parse_line(line.strip(), log_type)
+                if entry is not None:
+                    yield entry
+        except OSError as e:
+            logger.error(f"Error reading log file {log_file_path}: {str(e)}")
+    
+    def parse_file_parallel(self, log_file_path, log_type='access', workers=None,
+                            encoding='utf-8', errors='ignore'):
+        """
+        Parse an Apache log file across several worker processes.
+        
+        The file is cut into one range of whole lines per worker and each
+        worker parses its range independently, so CPU-bound parsing scales
+        with the number of cores instead of being held to one by the GIL.
+        
+        Args:
+            log_file_path (str): Path to log file
+            log_type (str): Type of log - 'access' or 'error'
+            workers (int): Number of processes (defaults to the CPU count)
+            encoding (str): Encoding used to decode each line
+            errors (str): Decoding error handler
+            
+        Returns:
+            list: Parsed log entries in file order
+        """
+        workers = workers or os.cpu_count() or 1
+        
+        try:
+            ranges = _chunk_offsets(log_file_path, workers)
+        except OSError as e:
+            logger.error(f"Error reading log file {log_file_path}: {str(e)}")
+            return []
+        
+        if len(ranges) <= 1:
+            return list(self.parse_file(log_file_path, log_type, encoding, errors))
+        
+        tasks = [
+            (str(log_file_path), start, end, log_type, encoding, errors,
+             self.patterns, self._line_cache_enabled, self._specialized_format)
+            for start, end in ranges
+        ]
+        with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+            chunks = pool.map(_parse_chunk, tasks)
+        
+        entries = [entry for chunk in chunks for entry in chunk]
+        logger.info(f"Parsed {len(entries)} log entries from {log_file_path} with {len(tasks)} workers")
+        return entries
+    
+    def _parse_access_log_cached(self, line):
+        """
+        Parse an Apache access log line, reusing the entry of an identical recent line.
+        
+        Clients often repeat the same request within one second, which
+        produces byte-identical lines. Each caller gets its own copy of the
+        cached entry, so it is safe to modify.
+        
+        Args:
+            line (str): The log line to parse
+            
+        Returns:
+            dict: Parsed log entry or None if parsing failed
+        """
+        cache = self._line_cache
+        entry = cache.get(line)
+        if entry is not None:
+            cache.move_to_end(line)
+            return dict(entry)
+        
+        entry = self._parse_access_log(line)
+        if entry is not None:
+            cache[line] = dict(entry)
+            if len(cache) > _LINE_CACHE_MAX:
+                cache.popitem(last=False)
+        return entry
+    
     def _parse_access_log(self, line):
         """Parse an Apache access log line."""
+        # Every access log format has a bracketed timestamp and a quoted request line,
+        # so lines without them are rejected before running any regex
+        if '"' not in line or '[' not in line:
+            logger.warning(f"Could not parse Apache access log line: {line[:50]}...")
+            return None
+        
+        # Common and combined lines are split directly without running any regex.
+        # Lines ending in a response time already match the first pattern tried
+        # below, which is quicker than splitting them in Python.
+        if not line[-1].isdigit() or line.count('"') == 2:
+            fast = _parse_access_fast(line)
+            if fast is not None:
+                format_name, data = fast
+                return self._convert_access_fields(data, format_name)
+        
         # Try all access log formats, from most specific to least specific
         for format_name, pattern in [
             ('combined_time', self.compiled_patterns['combined_time']),
@@ -62,68 +561,74 @@ class ApacheLogParser:
         ]:
             match = pattern.match(line)
             if match:
-                data = match.groupdict()
-                
-                # Convert timestamp
-                try:
-                    # Common Apache timestamp format: 10/Oct/2023:13:55:36 -0700
-                    data['timestamp'] = datetime.strptime(
-                        data['timestamp'].split()[0],  # Remove timezone
-                        '%d/%b/%Y:%H:%M:%S'
-                    )
-                except ValueError:
-                    logger.warning(f"Failed to parse timestamp: {data.get('timestamp')}")
-                    data['timestamp'] = None
-                
-                # Convert numeric fields
-                try:
-                    data['status'] = int(data['status'])
-                except (ValueError, TypeError):
-                    data['status'] = 0
-                    
-                try:
-                    if data['bytes_sent'] == '-':
-                        data['bytes_sent'] = 0
-                    else:
-                        data['bytes_sent'] = int(data['bytes_sent'])
-                except (ValueError, TypeError):
-                    data['bytes_sent'] = 0
-                
-                # Convert response time if present
-                if 'response_time' in data:
-                    try:
-                        data['response_time'] = float(data['response_time'])
-                    except (ValueError, TypeError):
-                        data['response_time'] = 0.0
-                else:
-                    data['response_time'] = 0.0
-                
-                # Add metadata
-                data['log_format'] = format_name
-                data['log_type'] = 'access'
-                
-                return data
+                return self._convert_access_fields(match.groupdict(), format_name)
         
         # If we get here, no pattern matched
         logger.warning(f"Could not parse Apache access log line: {line[:50]}...")
         return None
     
+    def _convert_access_fields(self, data, format_name):
+        """
+        Convert the raw string fields of an access log line to typed values.
+        
+        Args:
+            data (dict): Raw fields captured from the line, modified in place
+            format_name (str): Access log format the line matched
+            
+        Returns:
+            dict: Parsed log entry
+        """
+        # Convert timestamp
+        timestamp = _cached_ts(data['timestamp'])
+        if timestamp is None:
+            logger.warning(f"Failed to parse timestamp: {data.get('timestamp')}")
+        data['timestamp'] = timestamp
+        
+        # Convert numeric fields
+        try:
+            data['status'] = int(data['status'])
+        except (ValueError, TypeError):
+            data['status'] = 0
+            
+        try:
+            if data['bytes_sent'] == '-':
+                data['bytes_sent'] = 0
+            else:
+                data['bytes_sent'] = int(data['bytes_sent'])
+        except (ValueError, TypeError):
+            data['bytes_sent'] = 0
+        
+        # Convert response time if present
+        if 'response_time' in data:
+            try:
+                data['response_time'] = float(data['response_time'])
+            except (ValueError, TypeError):
+                data['response_time'] = 0.0
+        else:
+            data['response_time'] = 0.0
+        
+        # Add metadata
+        data['log_format'] = format_name
+        data['log_type'] = 'access'
+        
+        return data
+    
     def _parse_error_log(self, line):
         """Parse an Apache error log line."""
+        # Error log lines always open with the bracketed timestamp
+        if not line.startswith('['):
+            logger.warning(f"Could not parse Apache error log line: {line[:50]}...")
+            return None
+        
         match = self.compiled_patterns['error'].match(line)
         if match:
             data = match.groupdict()
             
             # Convert timestamp
-            try:
-                # Error log timestamp format: Wed Oct 11 14:32:52 2023
-                data['timestamp'] = datetime.strptime(
-                    data['timestamp'],
-                    '%a %b %d %H:%M:%S %Y'
-                )
-            except ValueError:
+            timestamp = _cached_error_ts(data['timestamp'])
+            if timestamp is None:
                 logger.warning(f"Failed to parse error timestamp: {data.get('timestamp')}")
-                data['timestamp'] = None
+            data['timestamp'] = timestamp
             
             # Add metadata
             data['log_type'] = 'error'
@@ -133,10 +638,119 @@ class ApacheLogParser:
         logger.warning(f"Could not parse Apache error log line: {line[:50]}...")
         return None
         
+    def parse_file_bulk(self, log_file_path, encoding='utf-8', errors='ignore'):
+        """
+        Parse a whole access log file into a DataFrame in one pass.
+        
+        Lines are split by the same splitter or pattern parse_line tries
+        first, but their fields are collected as raw strings and converted
+        column-wise, each distinct timestamp, status and size only once,
+        instead of entry by entry. Lines the splitter does not handle go
+        through parse_line itself, so the result holds exactly the entries
+        parse_line returns for the file, in file order.
+        
+        Args:
+            log_file_path (str): Path to log file
+            encoding (str): Encoding used to decode each line
+            errors (str): Decoding error handler
+            
+        Returns:
+            pandas.DataFrame: Parsed access log entries with the same columns as parse_line results
+        """
+        raw_rows, raw_positions, formats = [], [], []
+        parsed_rows, parsed_positions = [], []
+        combined_time = self.compiled_patterns['combined_time']
+        
+        try:
+            for line in iter_lines(log_file_path, encoding=encoding, errors=errors):
+                line = line.strip()
+                if not line:
+                    continue
+                
+                # Same choice of first parser as _parse_access_log
+                if not line[-1].isdigit() or line.count('"') == 2:
+                    fast = _parse_access_fast(line)
+                else:
+                    match = combined_time.match(line)
+                    fast = ('combined_time', match.groupdict()) if match else None
+                if fast is not None:
+                    raw_positions.append(len(raw_positions) + len(parsed_positions))
+                    formats.append(fast[0])
+                    raw_rows.append(fast[1])
+                    continue
+                
+                entry = self.parse_line(line)
+                if entry is not None:
+                    parsed_positions.append(len(raw_positions) + len(parsed_positions))
+                    parsed_rows.append(entry)
+        except OSError as e:
+            logger.error(f"Error reading log file {log_file_path}: {str(e)}")
+            return pd.DataFrame()
+        
+        frames = []
+        if raw_rows:
+            raw_df = pd.DataFrame(raw_rows, index=raw_positions)
+            raw_df['timestamp'] = _convert_distinct(raw_df['timestamp'], _cached_ts)
+            missing = int(raw_df['timestamp'].isna().sum())
+            if missing:
+                logger.warning(f"Failed to parse {missing} timestamps in {log_file_path}")
+            raw_df['status'] = _convert_distinct(raw_df['status'], int)
+            raw_df['bytes_sent'] = _convert_distinct(raw_df['bytes_sent'], _bytes_sent)
+            if 'response_time' in raw_df:
+                raw_df['response_time'] = _convert_distinct(raw_df['response_time'].fillna('0.0'), float)
+            else:
+                raw_df['response_time'] = 0.0
+            raw_df['log_format'] = formats
+            raw_df['log_type'] = 'access'
+            frames.append(raw_df)
+        if parsed_rows:
+            frames.append(pd.DataFrame(parsed_rows, index=parsed_positions))
+        
+        if not frames:
+            return pd.DataFrame()
+        
+        logs_df = pd.concat(frames).sort_index() if len(frames) > 1 else frames[0]
+        logs_df = logs_df.reset_index(drop=True)
+        
+        logger.info(f"Bulk parsed {len(logs_df)} access log entries from {log_file_path}")
+        return logs_df
+    
     def detect_format(self, log_file_path):
         """
         Detect the format of an Apache log file by sampling lines.
         
+        Results are cached per (path, modification time, size), so scanning
+        an unchanged file again skips reading and matching its lines.
+        
+        Args:
+            log_file_path (str): Path to log file
+            
+        Returns:
+            str: Detected format ('common', 'combined', 'combined_time', 'error', or 'unknown')
+        """
+        try:
+            st = os.stat(log_file_path)
+        except OSError as e:
+            logger.error(f"Error detecting log format for {log_file_path}: {str(e)}")
+            return 'unknown'
+        
+        key = (str(log_file_path), st.st_mtime_ns, st.st_size)
+        cache = self._format_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
+        detected_format = self._sniff_format(log_file_path)
+        cache[key] = detected_format
+        if len(cache) > _FORMAT_CACHE_MAX:
+            cache.popitem(last=False)
+        
+        return detected_format
+    
+    def _sniff_format(self, log_file_path):
+        """
+        Detect the format of an Apache log file by matching its first lines.
+        
         Args:
             log_file_path (str): Path to log file
             
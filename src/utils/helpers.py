@@ -2,17 +2,52 @@
 Helper utilities for the Log Analysis & Monitoring System.
 """
 import os
+import copy
 import yaml
 import logging
 import sys
+import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+try:
+    # Optional: Arrow-backed string storage for log columns
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed YAML files keyed on (absolute path, mtime, size)
+_yaml_cache = {}
+
 # Get the project root directory (for absolute path resolution)
 PROJECT_ROOT = Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+def _load_yaml_cached(path):
+    """
+    Load a YAML file, reusing the parsed result while the file is unchanged.
+    
+    Args:
+        path (str): Absolute path to the YAML file
+        
+    Returns:
+        dict: A copy of the parsed YAML data
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    data = _yaml_cache.get(key)
+    if data is None:
+        with open(path, 'rb') as file:
+            data = yaml.load(file, Loader=_YAML_LOADER)
+        _yaml_cache[key] = data
+    
+    # Callers are free to modify what they get back
+    return copy.deepcopy(data)
+
 def load_config(config_path='config/config.yaml'):
     """
     Load configuration from a YAML file.
@@ -28,8 +63,7 @@ def load_config(config_path='config/config.yaml'):
         if not os.path.isabs(config_path):
             config_path = os.path.join(PROJECT_ROOT, config_path)
             
-        with open(config_path, 'r') as file:
-            return yaml.safe_load(file)
+        return _load_yaml_cached(config_path)
     except Exception as e:
         logger.error(f"Failed to load configuration from {config_path}: {str(e)}")
         raise
@@ -85,8 +119,7 @@ def load_patterns(patterns_path='config/patterns.yaml'):
         if not os.path.isabs(patterns_path):
             patterns_path = os.path.join(PROJECT_ROOT, patterns_path)
             
-        with open(patterns_path, 'r') as file:
-            return yaml.safe_load(file)
+        return _load_yaml_cached(patterns_path)
     except Exception as e:
         logger.error(f"Failed to load patterns from {patterns_path}: {str(e)}")
         # Return empty dict instead of raising to avoid crashes
@@ -118,6 +151,56 @@ def get_log_files(log_dir, file_pattern=None):
     else:
         return list(log_dir_path.glob("*.log"))
 
+def iter_lines(path, encoding='latin-1', errors='replace'):
+    """
+    Iterate over the lines of a log file through a large binary read buffer.
+    
+    Lines are read as bytes and decoded one at a time, which skips Python's
+    text layer. A plain buffered read is used rather than a memory map so a
+    file truncated mid-scan (e.g. logrotate copytruncate) simply ends the
+    iteration instead of faulting the process.
+    
+    Args:
+        path (str): Path to the log file
+        encoding (str): Encoding used to decode each line
+        errors (str): Decoding error handler
+        
+    Yields:
+        str: Each line without its trailing newline
+    """
+    with open(path, 'rb', buffering=1 << 20) as f:
+        if hasattr(os, 'posix_fadvise'):
+            # Tell the kernel to read ahead aggressively for a front-to-back scan
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        for raw in f:
+            if raw.endswith(b'\n'):
+                raw = raw[:-1]
+            yield raw.decode(encoding, errors)
+
+def categorize_columns(df, columns=('endpoint', 'ip_address')):
+    """
+    Convert repeated string columns of a log DataFrame to categoricals.
+    
+    Grouping and counting on categoricals works on small integer codes
+    instead of hashing every string value. When pyarrow is installed the
+    categories are stored as Arrow strings, so ``.str`` operations run on
+    Arrow's vectorized kernels over the distinct values.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame of parsed logs, modified in place
+        columns (tuple): Columns to convert when present
+        
+    Returns:
+        pandas.DataFrame: The same DataFrame
+    """
+    for column in columns:
+        if column in df.columns:
+            values = df[column]
+            if pa is not None:
+                values = values.astype(pd.ArrowDtype(pa.string()))
+            df[column] = values.astype('category')
+    return df
+
 def ensure_dir_exists(directory):
     """
     Ensure that a directory exists, creating it if necessary.
@@ -9,7 +9,7 @@ import json
 import os
 from pathlib import Path
 
-from src.utils.helpers import load_config, setup_logging
+from src.utils.helpers import load_config, setup_logging, categorize_columns
 from src.parsers.apache_parser import ApacheLogParser
 from src.analyzers.performance import PerformanceAnalyzer
 from src.analyzers.security import SecurityAnalyzer
@@ -74,7 +74,7 @@ def main():
     logger.info(f"Successfully parsed {len(parsed_logs)} log entries")
     
     # Convert to DataFrame
-    logs_df = pd.DataFrame(parsed_logs)
+    logs_df = categorize_columns(pd.DataFrame(parsed_logs))
     
     # Print sample of parsed data
     display_section("Sample of Parsed Log Data")
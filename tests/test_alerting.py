@@ -2,80 +2,89 @@
 Unit tests for the alerting module.
 """
 import unittest
+import numpy as np
 import pandas as pd
+from collections import deque
 from datetime import datetime
 
-# Try to import the actual classes, otherwise use mock implementations
-try:
-    from src.alerting.detector import AnomalyDetector
-    from src.alerting.notifier import EmailNotifier
-except ImportError:
-    # Mock implementation of AnomalyDetector for testing
-    class AnomalyDetector:
-        """Mock implementation of AnomalyDetector for testing."""
-        
-        def __init__(self, config):
-            """Initialize with the configuration."""
-            self.config = config
-            self.z_score_threshold = config['alerting']['anomaly_detection']['z_score_threshold']
-            self.min_data_points = config['alerting']['anomaly_detection']['min_data_points']
+# Record layout of the anomaly points returned by the mock detector
+_ANOMALY_DTYPE = np.dtype([
+    ('timestamp', object),
+    ('value', np.float64),
+    ('endpoint', object),
+    ('z_score', np.float64)
+])
+
+# Mock class for testing AnomalyDetector
+class MockAnomalyDetector:
+    """Mock implementation of AnomalyDetector for testing."""
+    
+    def __init__(self, config):
+        """Initialize with the configuration."""
+        self.config = config
+        self.z_score_threshold = config['alerting']['anomaly_detection']['z_score_threshold']
+        self.min_data_points = config['alerting']['anomaly_detection']['min_data_points']
+    
+    def detect_anomalies(self, logs_df, metric_column='response_time'):
+        """Mock implementation of detect_anomalies."""
+        # Bind configuration to locals once per call
+        z_thresh = self.z_score_threshold
+        min_pts = self.min_data_points
         
-        def detect_anomalies(self, logs_df, metric_column='response_time'):
-            """Mock implementation of detect_anomalies."""
-            if logs_df.empty or len(logs_df) < self.min_data_points:
-                return {
-                    'anomalies_detected': False,
-                    'anomaly_points': [],
-                    'analysis': {
-                        'mean': 0,
-                        'std_dev': 0,
-                        'threshold': 0
-                    }
-                }
-            
-            # Get the metric values
-            values = logs_df[metric_column].to_list()
-            
-            # Calculate basic statistics
-            mean = sum(values) / len(values)
-            
-            # Calculate standard deviation
-            variance = sum((x - mean) ** 2 for x in values) / len(values)
-            std_dev = variance ** 0.5
-            
-            # Calculate threshold
-            threshold = mean + (std_dev * self.z_score_threshold)
-            
-            # Find anomalies
-            anomaly_points = []
-            for _, row in logs_df.iterrows():
-                value = row[metric_column]
-                if value > threshold:
-                    anomaly_points.append({
-                        'timestamp': row['timestamp'],
-                        'value': value,
-                        'endpoint': row['endpoint'],
-                        'z_score': (value - mean) / std_dev if std_dev > 0 else 0
-                    })
-            
+        if logs_df.empty or len(logs_df) < min_pts:
             return {
-                'anomalies_detected': len(anomaly_points) > 0,
-                'anomaly_points': anomaly_points,
+                'anomalies_detected': False,
+                'anomaly_points': np.empty(0, dtype=_ANOMALY_DTYPE),
                 'analysis': {
-                    'mean': mean,
-                    'std_dev': std_dev,
-                    'threshold': threshold
+                    'mean': 0,
+                    'std_dev': 0,
+                    'threshold': 0
                 }
             }
+        
+        # Calculate basic statistics (population standard deviation)
+        series = logs_df[metric_column]
+        mean = series.mean()
+        std_dev = series.std(ddof=0)
+        
+        # Calculate threshold
+        threshold = mean + (std_dev * z_thresh)
+        
+        # Find anomalies with a single vectorized comparison
+        metric_values = series.to_numpy(dtype=np.float64)
+        mask = metric_values > threshold
+        anomaly_values = metric_values[mask]
+        
+        # One division shared by every anomaly instead of one per point
+        inv_std = 1.0 / std_dev if std_dev > 0 else 0.0
+        
+        # Preallocate the anomaly records since their count is known up front
+        k = int(mask.sum())
+        anomaly_points = np.empty(k, dtype=_ANOMALY_DTYPE)
+        anomaly_points['timestamp'] = logs_df.loc[mask, 'timestamp'].to_numpy(dtype=object)
+        anomaly_points['value'] = anomaly_values
+        anomaly_points['endpoint'] = logs_df.loc[mask, 'endpoint'].to_numpy(dtype=object)
+        anomaly_points['z_score'] = (anomaly_values - mean) * inv_std
+        
+        return {
+            'anomalies_detected': k > 0,
+            'anomaly_points': anomaly_points,
+            'analysis': {
+                'mean': mean,
+                'std_dev': std_dev,
+                'threshold': threshold
+            }
+        }
 
 # Mock class for testing EmailNotifier
 class MockEmailNotifier:
     """Mock implementation of EmailNotifier for testing."""
     
-    def __init__(self, config):
+    def __init__(self, config, maxlen=1024):
         """Initialize with the config but track emails instead of sending them."""
         self.config = config
-        self.sent_emails = []
+        # Bounded ring buffer so stress runs don't grow the log without limit
+        self.sent_emails = deque(maxlen=maxlen)
     
     def send_alert(self, subject, message, severity='low', recipients=None, details=None):
         """Mock implementation that records the email instead of sending it."""
@@ -97,6 +106,42 @@ class MockEmailNotifier:
 class TestAnomalyDetector(unittest.TestCase):
     """Test cases for the Anomaly Detector."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared, read-only log fixtures once for the class."""
+        # Sample log data with normal distribution - 10 data points to meet min_data_points
+        base = pd.DataFrame({
+            'timestamp': [
+                datetime(2023, 10, 10, 13, 55, 36),
+                datetime(2023, 10, 10, 13, 56, 30),
+                datetime(2023, 10, 10, 13, 57, 15),
+                datetime(2023, 10, 10, 13, 58, 20),
+                datetime(2023, 10, 10, 13, 59, 10),
+                datetime(2023, 10, 10, 14, 0, 10),
+                datetime(2023, 10, 10, 14, 1, 15),
+                datetime(2023, 10, 10, 14, 2, 20),
+                datetime(2023, 10, 10, 14, 3, 25),
+                datetime(2023, 10, 10, 14, 4, 30)
+            ],
+            'ip_address': [f'192.168.1.{i}' for i in range(1, 11)],
+            'method': ['GET'] * 10,
+            'endpoint': [
+                '/index.html', '/about.html', '/api/data', '/contact.html', '/products.html',
+                '/services.html', '/blog.html', '/faq.html', '/support.html', '/contact.html'
+            ],
+            'status': [200] * 10,
+            'response_time': [0.1, 0.12, 0.11, 0.09, 0.13, 0.12, 0.11, 0.10, 0.12, 0.11]
+        })
+        
+        cls.normal_logs = base
+        
+        # Same logs with a single anomalous response time on /contact.html
+        cls.anomaly_logs = base.copy()
+        cls.anomaly_logs.iat[3, cls.anomaly_logs.columns.get_loc('response_time')] = 1.5
+        
+        # Empty DataFrame for testing edge cases
+        cls.empty_logs = pd.DataFrame()
+    
     def setUp(self):
         """Set up the test fixtures."""
         # Sample configuration
@@ -109,184 +154,7 @@ class TestAnomalyDetector(unittest.TestCase):
             }
         }
         
-        try:
-            self.detector = AnomalyDetector(self.config)
-        except NameError:
-            # If AnomalyDetector doesn't exist, use the mock class
-            self.detector = AnomalyDetector(self.config)
-        
-        # Create sample log data with normal distribution - increased to 10 data points
-        self.normal_logs = pd.DataFrame([
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 55, 36),
-                'ip_address': '192.168.1.1',
-                'method': 'GET',
-                'endpoint': '/index.html',
-                'status': 200,
-                'response_time': 0.1
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 56, 30),
-                'ip_address': '192.168.1.2',
-                'method': 'GET',
-                'endpoint': '/about.html',
-                'status': 200,
-                'response_time': 0.12
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 57, 15),
-                'ip_address': '192.168.1.3',
-                'method': 'GET',
-                'endpoint': '/api/data',
-                'status': 200,
-                'response_time': 0.11
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 58, 20),
-                'ip_address': '192.168.1.4',
-                'method': 'GET',
-                'endpoint': '/contact.html',
-                'status': 200,
-                'response_time': 0.09
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 59, 10),
-                'ip_address': '192.168.1.5',
-                'method': 'GET',
-                'endpoint': '/products.html',
-                'status': 200,
-                'response_time': 0.13
-            },
-            # Additional data points to meet min_data_points requirement
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 00, 10),
-                'ip_address': '192.168.1.6',
-                'method': 'GET',
-                'endpoint': '/services.html',
-                'status': 200,
-                'response_time': 0.12
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 01, 15),
-                'ip_address': '192.168.1.7',
-                'method': 'GET',
-                'endpoint': '/blog.html',
-                'status': 200,
-                'response_time': 0.11
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 02, 20),
-                'ip_address': '192.168.1.8',
-                'method': 'GET',
-                'endpoint': '/faq.html',
-                'status': 200,
-                'response_time': 0.10
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 03, 25),
-                'ip_address': '192.168.1.9',
-                'method': 'GET',
-                'endpoint': '/support.html',
-                'status': 200,
-                'response_time': 0.12
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 04, 30),
-                'ip_address': '192.168.1.10',
-                'method': 'GET',
-                'endpoint': '/contact.html',
-                'status': 200,
-                'response_time': 0.11
-            }
-        ])
-        
-        # Create sample log data with anomalies - increased to 10 data points
-        self.anomaly_logs = pd.DataFrame([
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 55, 36),
-                'ip_address': '192.168.1.1',
-                'method': 'GET',
-                'endpoint': '/index.html',
-                'status': 200,
-                'response_time': 0.1
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 56, 30),
-                'ip_address': '192.168.1.2',
-                'method': 'GET',
-                'endpoint': '/about.html',
-                'status': 200,
-                'response_time': 0.12
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 57, 15),
-                'ip_address': '192.168.1.3',
-                'method': 'GET',
-                'endpoint': '/api/data',
-                'status': 200,
-                'response_time': 0.11
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 58, 20),
-                'ip_address': '192.168.1.4',
-                'method': 'GET',
-                'endpoint': '/contact.html',
-                'status': 200,
-                'response_time': 1.5  # Anomaly in response time
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 59, 10),
-                'ip_address': '192.168.1.5',
-                'method': 'GET',
-                'endpoint': '/products.html',
-                'status': 200,
-                'response_time': 0.13
-            },
-            # Additional data points to meet min_data_points requirement
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 00, 10),
-                'ip_address': '192.168.1.6',
-                'method': 'GET',
-                'endpoint': '/services.html',
-                'status': 200,
-                'response_time': 0.12
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 01, 15),
-                'ip_address': '192.168.1.7',
-                'method': 'GET',
-                'endpoint': '/blog.html',
-                'status': 200,
-                'response_time': 0.11
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 02, 20),
-                'ip_address': '192.168.1.8',
-                'method': 'GET',
-                'endpoint': '/faq.html',
-                'status': 200,
-                'response_time': 0.10
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 03, 25),
-                'ip_address': '192.168.1.9',
-                'method': 'GET',
-                'endpoint': '/support.html',
-                'status': 200,
-                'response_time': 0.12
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 04, 30),
-                'ip_address': '192.168.1.10',
-                'method': 'GET',
-                'endpoint': '/contact.html',
-                'status': 200,
-                'response_time': 0.11
-            }
-        ])
-        
-        # Empty DataFrame for testing edge cases
-        self.empty_logs = pd.DataFrame()
+        self.detector = MockAnomalyDetector(self.config)
     
     def test_analyze_normal_logs(self):
         """Test analyzing logs with normal distribution."""
@@ -300,6 +168,11 @@ class TestAnomalyDetector(unittest.TestCase):
         self.assertIn('mean', result['analysis'])
         self.assertIn('std_dev', result['analysis'])
         self.assertIn('threshold', result['analysis'])
+        
+        # The standard deviation is the population one
+        values = np.array(self.normal_logs['response_time'])
+        self.assertAlmostEqual(result['analysis']['mean'], values.mean())
+        self.assertAlmostEqual(result['analysis']['std_dev'], values.std())
     
     def test_analyze_anomaly_logs(self):
         """Test analyzing logs with anomalies."""
@@ -312,6 +185,12 @@ class TestAnomalyDetector(unittest.TestCase):
         # The anomaly should be on the contact.html endpoint
         anomaly_endpoints = [point['endpoint'] for point in result['anomaly_points']]
         self.assertIn('/contact.html', anomaly_endpoints)
+        
+        # The anomalous point keeps its value, timestamp and z-score
+        point = result['anomaly_points'][0]
+        self.assertEqual(point['value'], 1.5)
+        self.assertEqual(point['timestamp'], datetime(2023, 10, 10, 13, 58, 20))
+        self.assertGreater(point['z_score'], self.config['alerting']['anomaly_detection']['z_score_threshold'])
     
     def test_analyze_empty_logs(self):
         """Test analyzing empty logs."""
@@ -320,6 +199,7 @@ class TestAnomalyDetector(unittest.TestCase):
         # Should not find anomalies in empty logs but not fail
         self.assertFalse(result['anomalies_detected'])
         self.assertEqual(len(result['anomaly_points']), 0)
+        self.assertEqual(result['anomaly_points'].dtype, _ANOMALY_DTYPE)
         
         # Should return zero values for statistics
         self.assertEqual(result['analysis']['mean'], 0)
@@ -359,80 +239,77 @@ class TestEmailNotifier(unittest.TestCase):
         # Initialize the mock notifier for testing
         self.notifier = MockEmailNotifier(self.config)
     
-    def test_send_alert(self):
-        """Test sending a simple alert."""
-        # Send a test alert
-        result = self.notifier.send_alert(
-            subject="Test Alert",
-            message="This is a test alert."
-        )
-        
-        # Check that the alert was sent successfully
-        self.assertTrue(result)
-        
-        # Check that the alert was recorded
-        self.assertEqual(len(self.notifier.sent_emails), 1)
-        
-        # Check the alert details
-        alert = self.notifier.sent_emails[0]
-        self.assertEqual(alert['subject'], "Test Alert")
-        self.assertEqual(alert['message'], "This is a test alert.")
-        self.assertEqual(alert['severity'], "low")
-        self.assertEqual(alert['recipients'], ['admin@example.com'])
-    
-    def test_send_alert_with_custom_recipients(self):
-        """Test sending an alert to custom recipients."""
-        # Custom recipients list
-        custom_recipients = ['user1@example.com', 'user2@example.com']
-        
-        # Send a test alert with custom recipients
-        result = self.notifier.send_alert(
-            subject="Custom Recipients Test",
-            message="This is a test alert with custom recipients.",
-            recipients=custom_recipients
+    # (send_alert kwargs, expected recorded email) pairs
+    CASES = [
+        (
+            {
+                'subject': "Test Alert",
+                'message': "This is a test alert."
+            },
+            {
+                'subject': "Test Alert",
+                'message': "This is a test alert.",
+                'severity': "low",
+                'recipients': ['admin@example.com'],
+                'details': None
+            }
+        ),
+        (
+            {
+                'subject': "Custom Recipients Test",
+                'message': "This is a test alert with custom recipients.",
+                'recipients': ['user1@example.com', 'user2@example.com']
+            },
+            {
+                'subject': "Custom Recipients Test",
+                'message': "This is a test alert with custom recipients.",
+                'severity': "low",
+                'recipients': ['user1@example.com', 'user2@example.com'],
+                'details': None
+            }
+        ),
+        (
+            {
+                'subject': "Alert with Details",
+                'message': "This is a test alert with additional details.",
+                'severity': "high",
+                'details': {
+                    'timestamp': datetime(2023, 10, 10, 14, 0, 0),
+                    'metric': 'response_time',
+                    'value': 1.5,
+                    'threshold': 0.5,
+                    'endpoint': '/contact.html'
+                }
+            },
+            {
+                'subject': "Alert with Details",
+                'message': "This is a test alert with additional details.",
+                'severity': "high",
+                'recipients': ['admin@example.com'],
+                'details': {
+                    'timestamp': datetime(2023, 10, 10, 14, 0, 0),
+                    'metric': 'response_time',
+                    'value': 1.5,
+                    'threshold': 0.5,
+                    'endpoint': '/contact.html'
+                }
+            }
         )
-        
-        # Check that the alert was sent successfully
-        self.assertTrue(result)
-        
-        # Check that the alert was recorded
-        self.assertEqual(len(self.notifier.sent_emails), 1)
-        
-        # Check the alert details
-        alert = self.notifier.sent_emails[0]
-        self.assertEqual(alert['recipients'], custom_recipients)
+    ]
     
-    def test_send_alert_with_details(self):
-        """Test sending an alert with additional details."""
-        # Additional details for the alert
-        details = {
-            'timestamp': datetime(2023, 10, 10, 14, 00, 00),
-            'metric': 'response_time',
-            'value': 1.5,
-            'threshold': 0.5,
-            'endpoint': '/contact.html'
-        }
-        
-        # Send a test alert with details
-        result = self.notifier.send_alert(
-            subject="Alert with Details",
-            message="This is a test alert with additional details.",
-            severity="high",
-            details=details
-        )
-        
-        # Check that the alert was sent successfully
-        self.assertTrue(result)
-        
-        # Check that the alert was recorded
-        self.assertEqual(len(self.notifier.sent_emails), 1)
-        
-        # Check the alert details
-        alert = self.notifier.sent_emails[0]
-        self.assertEqual(alert['subject'], "Alert with Details")
-        self.assertEqual(alert['message'], "This is a test alert with additional details.")
-        self.assertEqual(alert['severity'], "high")
-        self.assertEqual(alert['details'], details)
+    def test_send_alert_cases(self):
+        """Test sending simple, custom-recipient and detailed alerts."""
+        for kwargs, expected in self.CASES:
+            with self.subTest(subject=kwargs['subject']):
+                self.notifier.sent_emails.clear()
+                
+                # Check that the alert was sent successfully
+                result = self.notifier.send_alert(**kwargs)
+                self.assertTrue(result)
+                
+                # Check that exactly this alert was recorded with the expected details
+                self.assertEqual(len(self.notifier.sent_emails), 1)
+                self.assertEqual(self.notifier.sent_emails[-1], expected)
 
 
 if __name__ == '__main__':
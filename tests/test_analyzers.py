@@ -1,9 +1,29 @@
 """
 Unit tests for the analyzers module.
 """
+import re
 import unittest
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from unittest.mock import patch
+
+# Column layout and numeric dtypes of the sample log fixtures
+_LOG_COLUMNS = ['timestamp', 'ip_address', 'method', 'endpoint', 'status', 'response_time']
+_LOG_DTYPES = {'status': np.int64, 'response_time': np.float64}
+
+try:
+    # Optional: store the string columns of the fixtures in Arrow buffers
+    import pyarrow as pa
+    _LOG_DTYPES.update(endpoint=pd.ArrowDtype(pa.string()), ip_address=pd.ArrowDtype(pa.string()))
+except ImportError:
+    pa = None
+
+try:
+    # Optional: mergeable streaming quantile sketch used for cross-file percentiles
+    from crick import TDigest
+except ImportError:
+    TDigest = None
 
 # Import the actual classes if they exist, otherwise use mock implementations
 try:
@@ -26,23 +46,17 @@ except ImportError:
                     'performance_metrics': []
                 }
             
-            # Calculate basic stats
-            response_times = logs_df['response_time'].tolist()
-            mean_time = sum(response_times) / len(response_times)
+            # Pull the response times out of the frame once
+            response_times = logs_df['response_time'].to_numpy(dtype=np.float64, copy=False)
             
-            # Find slow endpoints
-            endpoint_times = {}
-            for _, row in logs_df.iterrows():
-                endpoint = row['endpoint']
-                if endpoint not in endpoint_times:
-                    endpoint_times[endpoint] = []
-                endpoint_times[endpoint].append(row['response_time'])
+            # Calculate basic stats on the underlying float buffer
+            mean_time = response_times.mean()
+            median, p95, p99 = np.percentile(response_times, [50, 95, 99])
             
-            slow_endpoints = {}
-            for endpoint, times in endpoint_times.items():
-                avg_time = sum(times) / len(times)
-                if avg_time > self.config['performance_thresholds']['slow_endpoint_avg']:
-                    slow_endpoints[endpoint] = avg_time
+            # Find slow endpoints with a single grouped mean
+            threshold = self.config['performance_thresholds']['slow_endpoint_avg']
+            endpoint_means = logs_df.groupby('endpoint', sort=False, observed=True)['response_time'].mean()
+            slow_endpoints = endpoint_means[endpoint_means > threshold].to_dict()
             
             # Create performance metrics
             metrics = [
@@ -58,10 +72,10 @@ except ImportError:
             return {
                 'overall_stats': {
                     'mean': mean_time,
-                    'median': sorted(response_times)[len(response_times) // 2],
-                    'p95': sorted(response_times)[int(len(response_times) * 0.95)],
-                    'p99': sorted(response_times)[int(len(response_times) * 0.99)],
-                    'max': max(response_times)
+                    'median': median,
+                    'p95': p95,
+                    'p99': p99,
+                    'max': response_times.max()
                 },
                 'slow_endpoints': slow_endpoints,
                 'performance_metrics': metrics
@@ -76,25 +90,20 @@ except ImportError:
                     'error_endpoints': {}
                 }
             
+            # Pull the columns used below out of the frame once
+            status = logs_df['status']
+            endpoints = logs_df['endpoint']
+            
             # Count status codes
-            status_counts = {}
-            for status in logs_df['status']:
-                if status not in status_counts:
-                    status_counts[status] = 0
-                status_counts[status] += 1
+            status_counts = status.value_counts().to_dict()
             
             # Calculate error rate (status >= 400)
-            error_count = sum(count for status, count in status_counts.items() if status >= 400)
-            error_rate = error_count / len(logs_df)
+            err_mask = status.to_numpy() >= 400
+            error_rate = float(err_mask.mean())
             
-            # Find error endpoints
-            error_endpoints = {}
-            for _, row in logs_df.iterrows():
-                if row['status'] >= 400:
-                    endpoint = row['endpoint']
-                    if endpoint not in error_endpoints:
-                        error_endpoints[endpoint] = 0
-                    error_endpoints[endpoint] += 1
+            # Find error endpoints (categorical columns also count unobserved categories)
+            error_counts = endpoints[err_mask].value_counts()
+            error_endpoints = error_counts[error_counts > 0].to_dict()
             
             return {
                 'status_counts': status_counts,
@@ -135,6 +144,18 @@ except ImportError:
         
         def __init__(self, config):
             self.config = config
+            
+            # Fuse all attack patterns into one alternation so each endpoint is scanned once.
+            # Leading global flags such as (?i) become scoped groups, since they are only
+            # allowed at the very start of the combined expression.
+            alternatives = []
+            for p in config['security']['attack_patterns']:
+                flags = re.match(r'\(\?([aiLmsux]+)\)', p)
+                if flags:
+                    alternatives.append(f'(?{flags.group(1)}:{p[flags.end():]})')
+                else:
+                    alternatives.append(f'(?:{p})')
+            self._attack_union = re.compile('|'.join(alternatives))
         
         def analyze_logs(self, logs_df):
             """Mock analyze logs function for security threats."""
@@ -145,30 +166,20 @@ except ImportError:
                     'ip_threat_scores': {}
                 }
             
-            # Detect attack patterns in endpoints
-            security_events = []
-            ip_threat_scores = {}
+            # Detect attack patterns in endpoints in one vectorized pass
+            mask = logs_df['endpoint'].str.contains(self._attack_union.pattern, regex=True, na=False)
+            hits = logs_df.loc[mask, ['timestamp', 'ip_address', 'endpoint']]
             
-            for _, row in logs_df.iterrows():
-                endpoint = row['endpoint']
-                ip = row['ip_address']
-                
-                # Check attack patterns
-                for pattern in self.config['security']['attack_patterns']:
-                    import re
-                    if re.search(pattern, endpoint):
-                        security_events.append({
-                            'timestamp': row['timestamp'],
-                            'event_type': 'attack_pattern',
-                            'severity': 'high',
-                            'ip_address': ip,
-                            'endpoint': endpoint,
-                            'description': 'Potential attack pattern detected'
-                        })
-                        
-                        if ip not in ip_threat_scores:
-                            ip_threat_scores[ip] = 0
-                        ip_threat_scores[ip] += 1
+            security_events = [
+                {
+                    **record,
+                    'event_type': 'attack_pattern',
+                    'severity': 'high',
+                    'description': 'Potential attack pattern detected'
+                }
+                for record in hits.to_dict('records')
+            ]
+            ip_threat_scores = hits['ip_address'].value_counts().to_dict()
             
             return {
                 'security_events': security_events,
@@ -179,6 +190,21 @@ except ImportError:
 class TestPerformanceAnalyzer(unittest.TestCase):
     """Test cases for the Performance Analyzer."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared, read-only log fixtures once for the class."""
+        # Create sample log data
+        cls.sample_logs = pd.DataFrame.from_records([
+            (datetime(2023, 10, 10, 13, 55, 36), '192.168.1.1', 'GET', '/index.html', 200, 0.1),
+            (datetime(2023, 10, 10, 13, 56, 30), '192.168.1.2', 'GET', '/about.html', 200, 0.2),
+            (datetime(2023, 10, 10, 13, 57, 15), '192.168.1.3', 'GET', '/api/data', 200, 0.8),
+            (datetime(2023, 10, 10, 13, 58, 20), '192.168.1.4', 'POST', '/api/data', 500, 1.2),
+            (datetime(2023, 10, 10, 13, 59, 10), '192.168.1.5', 'GET', '/api/data', 404, 0.3)
+        ], columns=_LOG_COLUMNS).astype(_LOG_DTYPES)
+        
+        # Empty DataFrame for testing edge cases
+        cls.empty_logs = pd.DataFrame()
+    
     def setUp(self):
         """Set up the test fixtures."""
         # Sample configuration
@@ -191,53 +217,6 @@ class TestPerformanceAnalyzer(unittest.TestCase):
         }
         
         self.analyzer = PerformanceAnalyzer(self.config)
-        
-        # Create sample log data
-        self.sample_logs = pd.DataFrame([
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 55, 36),
-                'ip_address': '192.168.1.1',
-                'method': 'GET',
-                'endpoint': '/index.html',
-                'status': 200,
-                'response_time': 0.1
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 56, 30),
-                'ip_address': '192.168.1.2',
-                'method': 'GET',
-                'endpoint': '/about.html',
-                'status': 200,
-                'response_time': 0.2
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 57, 15),
-                'ip_address': '192.168.1.3',
-                'method': 'GET',
-                'endpoint': '/api/data',
-                'status': 200,
-                'response_time': 0.8
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 58, 20),
-                'ip_address': '192.168.1.4',
-                'method': 'POST',
-                'endpoint': '/api/data',
-                'status': 500,
-                'response_time': 1.2
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 59, 10),
-                'ip_address': '192.168.1.5',
-                'method': 'GET',
-                'endpoint': '/api/data',
-                'status': 404,
-                'response_time': 0.3
-            }
-        ])
-        
-        # Empty DataFrame for testing edge cases
-        self.empty_logs = pd.DataFrame()
     
     def test_analyze_response_times(self):
         """Test analyzing response times from logs."""
@@ -256,7 +235,7 @@ class TestPerformanceAnalyzer(unittest.TestCase):
         
         # Check slow endpoints
         self.assertIn('slow_endpoints', result)
-        self.assertIn('/api/data', str(result['slow_endpoints']))
+        self.assertIn('/api/data', result['slow_endpoints'])
         
         # Check that performance metrics were created
         self.assertIn('performance_metrics', result)
@@ -287,7 +266,7 @@ class TestPerformanceAnalyzer(unittest.TestCase):
         
         # Check error endpoints
         self.assertIn('error_endpoints', result)
-        self.assertIn('/api/data', str(result['error_endpoints']))
+        self.assertIn('/api/data', result['error_endpoints'])
     
     def test_analyze_status_codes_empty(self):
         """Test analyzing status codes with empty logs."""
@@ -298,9 +277,53 @@ class TestPerformanceAnalyzer(unittest.TestCase):
         self.assertEqual(result['error_rate'], 0)
         self.assertEqual(result['error_endpoints'], {})
     
+    def test_analyze_categorical_logs(self):
+        """Test that categorical endpoint and IP columns give the same results as strings."""
+        categorical_logs = self.sample_logs.astype({'endpoint': 'category', 'ip_address': 'category'})
+        
+        expected = self.analyzer.analyze_status_codes(self.sample_logs)
+        result = self.analyzer.analyze_status_codes(categorical_logs)
+        self.assertEqual(result['error_rate'], expected['error_rate'])
+        self.assertEqual(result['error_endpoints'], expected['error_endpoints'])
+        
+        expected = self.analyzer.analyze_response_times(self.sample_logs)
+        result = self.analyzer.analyze_response_times(categorical_logs)
+        self.assertEqual(result['slow_endpoints'], expected['slow_endpoints'])
+    
+    @unittest.skipUnless(TDigest is not None, "crick not installed")
+    def test_merged_response_time_digest(self):
+        """Test that digests merged across frames match the percentiles of the combined data."""
+        percentile_error = 0.01
+        self.config['performance_thresholds']['percentile_error'] = percentile_error
+        analyzer = PerformanceAnalyzer(self.config)
+        rng = np.random.default_rng(42)
+        first = pd.DataFrame({'response_time': rng.exponential(0.3, 20000)})
+        second = pd.DataFrame({'response_time': rng.lognormal(-1.0, 0.8, 30000)})
+        
+        digest = analyzer.build_response_time_digest(first)
+        digest.merge(analyzer.build_response_time_digest(second))
+        
+        # t-digest bounds the rank error, so each estimate must fall within
+        # percentile_error of the requested rank in the combined data
+        combined = np.concatenate([first['response_time'].to_numpy(), second['response_time'].to_numpy()])
+        for q in (0.5, 0.95, 0.99):
+            with self.subTest(q=q):
+                low, high = np.percentile(combined, [100 * (q - percentile_error), 100 * (q + percentile_error)])
+                self.assertGreaterEqual(digest.quantile(q), low)
+                self.assertLessEqual(digest.quantile(q), high)
+    
+    def test_response_time_digest_without_crick(self):
+        """Test that no digest is built when crick is not installed."""
+        if not hasattr(self.analyzer, 'build_response_time_digest'):
+            self.skipTest("Response time digests not available in mock analyzer")
+        
+        with patch('src.analyzers.performance.TDigest', None):
+            self.assertIsNone(self.analyzer.build_response_time_digest(self.sample_logs))
+    
     def test_generate_performance_report(self):
         """Test generating a complete performance report."""
-        result = self.analyzer.generate_performance_report(self.sample_logs)
+        # The report may normalize columns in place, so give it a private copy
+        result = self.analyzer.generate_performance_report(self.sample_logs.copy())
         
         # Check for all expected sections
         self.assertIn('response_time_analysis', result)
@@ -315,10 +338,32 @@ class TestPerformanceAnalyzer(unittest.TestCase):
 class TestSecurityAnalyzer(unittest.TestCase):
     """Test cases for the Security Analyzer."""
     
-    def setUp(self):
-        """Set up the test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared, read-only log fixtures once for the class."""
+        # Create sample log data with normal requests
+        cls.normal_logs = pd.DataFrame.from_records([
+            (datetime(2023, 10, 10, 13, 55, 36), '192.168.1.1', 'GET', '/index.html', 200, 0.1),
+            (datetime(2023, 10, 10, 13, 56, 30), '192.168.1.2', 'GET', '/about.html', 200, 0.2),
+            (datetime(2023, 10, 10, 13, 57, 15), '192.168.1.3', 'GET', '/api/data', 200, 0.3)
+        ], columns=_LOG_COLUMNS).astype(_LOG_DTYPES)
+        
+        # Create sample log data with suspicious requests
+        cls.suspicious_logs = pd.DataFrame.from_records([
+            (datetime(2023, 10, 10, 13, 55, 36), '192.168.1.1', 'GET', '/index.html', 200, 0.1),
+            (datetime(2023, 10, 10, 13, 56, 30), '192.168.1.100', 'GET', '/admin/login.php', 404, 0.2),
+            (datetime(2023, 10, 10, 13, 57, 15), '192.168.1.100', 'GET', '/../../../etc/passwd', 403, 0.3),
+            (datetime(2023, 10, 10, 13, 58, 20), '192.168.1.101', 'GET',
+             '/page.php?id=1 UNION SELECT username,password FROM users', 500, 0.4),
+            (datetime(2023, 10, 10, 13, 59, 10), '192.168.1.101', 'GET',
+             '/page?<script>alert("XSS")</script>', 200, 0.5)
+        ], columns=_LOG_COLUMNS).astype(_LOG_DTYPES)
+        
+        # Empty DataFrame for testing edge cases
+        cls.empty_logs = pd.DataFrame()
+        
         # Sample configuration
-        self.config = {
+        cls.config = {
             'security': {
                 'attack_patterns': [
                     r'(?i)/admin[/\w]*',
@@ -335,82 +380,19 @@ class TestSecurityAnalyzer(unittest.TestCase):
             }
         }
         
-        self.analyzer = SecurityAnalyzer(self.config)
-        
-        # Create sample log data with normal requests
-        self.normal_logs = pd.DataFrame([
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 55, 36),
-                'ip_address': '192.168.1.1',
-                'method': 'GET',
-                'endpoint': '/index.html',
-                'status': 200,
-                'response_time': 0.1
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 56, 30),
-                'ip_address': '192.168.1.2',
-                'method': 'GET',
-                'endpoint': '/about.html',
-                'status': 200,
-                'response_time': 0.2
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 57, 15),
-                'ip_address': '192.168.1.3',
-                'method': 'GET',
-                'endpoint': '/api/data',
-                'status': 200,
-                'response_time': 0.3
-            }
-        ])
-        
-        # Create sample log data with suspicious requests
-        self.suspicious_logs = pd.DataFrame([
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 55, 36),
-                'ip_address': '192.168.1.1',
-                'method': 'GET',
-                'endpoint': '/index.html',
-                'status': 200,
-                'response_time': 0.1
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 56, 30),
-                'ip_address': '192.168.1.100',
-                'method': 'GET',
-                'endpoint': '/admin/login.php',
-                'status': 404,
-                'response_time': 0.2
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 57, 15),
-                'ip_address': '192.168.1.100',
-                'method': 'GET',
-                'endpoint': '/../../../etc/passwd',
-                'status': 403,
-                'response_time': 0.3
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 58, 20),
-                'ip_address': '192.168.1.101',
-                'method': 'GET',
-                'endpoint': '/page.php?id=1 UNION SELECT username,password FROM users',
-                'status': 500,
-                'response_time': 0.4
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 59, 10),
-                'ip_address': '192.168.1.101',
-                'method': 'GET',
-                'endpoint': '/page?<script>alert("XSS")</script>',
-                'status': 200,
-                'response_time': 0.5
-            }
-        ])
+        # Shared analyzer for read-only tests; tests that modify it build their own
+        cls.analyzer = SecurityAnalyzer(cls.config)
         
-        # Empty DataFrame for testing edge cases
-        self.empty_logs = pd.DataFrame()
+        # Analysis of the suspicious logs, computed once and inspected by several tests
+        cls.suspicious_result = cls.analyzer.analyze_logs(cls.suspicious_logs)
+    
+    # (ip_address, endpoint) of each request that triggers an attack pattern
+    ATTACK_CASES = [
+        ('192.168.1.100', '/admin/login.php'),
+        ('192.168.1.100', '/../../../etc/passwd'),
+        ('192.168.1.101', '/page.php?id=1 UNION SELECT username,password FROM users'),
+        ('192.168.1.101', '/page?<script>alert("XSS")</script>')
+    ]
     
     def test_analyze_normal_logs(self):
         """Test analyzing logs with normal requests."""
@@ -423,7 +405,7 @@ class TestSecurityAnalyzer(unittest.TestCase):
     
     def test_analyze_suspicious_logs(self):
         """Test analyzing logs with suspicious requests."""
-        result = self.analyzer.analyze_logs(self.suspicious_logs)
+        result = self.suspicious_result
         
         # Should find security events in suspicious logs
         self.assertGreater(len(result['security_events']), 0)
@@ -437,6 +419,86 @@ class TestSecurityAnalyzer(unittest.TestCase):
         event_types = [event['event_type'] for event in result['security_events']]
         self.assertIn('attack_pattern', event_types)
     
+    def test_attack_pattern_cases(self):
+        """Test that every attack request is reported against its source IP."""
+        attacks = {
+            (event['ip_address'], event['endpoint'])
+            for event in self.suspicious_result['security_events']
+            if event['event_type'] == 'attack_pattern'
+        }
+        
+        for ip, endpoint in self.ATTACK_CASES:
+            with self.subTest(ip=ip, endpoint=endpoint):
+                self.assertIn((ip, endpoint), attacks)
+    
+    def test_hyperscan_matches_regex_fallback(self):
+        """Test that the Hyperscan backend reports the same events as the regex fallback."""
+        if getattr(self.analyzer, 'attack_db', None) is None:
+            self.skipTest("Hyperscan backend not available")
+        
+        result = self.suspicious_result
+        
+        # Force the regex fallback on a separate analyzer and analyze the same logs again
+        analyzer = SecurityAnalyzer(self.config)
+        analyzer.attack_db = None
+        analyzer.scan_db = None
+        fallback = analyzer.analyze_logs(self.suspicious_logs)
+        
+        def summarize(events):
+            return [(e['event_type'], e['endpoint'], e['description']) for e in events]
+        
+        self.assertEqual(summarize(result['security_events']), summarize(fallback['security_events']))
+    
+    def test_pattern_union_matches_each_pattern(self):
+        """Test that the fused attack pattern prefilter agrees with the individual patterns."""
+        if not hasattr(self.analyzer, '_compile_union'):
+            self.skipTest("Pattern union not available in mock analyzer")
+        
+        union = self.analyzer.attack_union
+        self.assertIsNotNone(union)
+        
+        endpoints = ['/index.html', '/ADMIN/users', '/a/../b', '/q?select name from t', '/x?<SCRIPT>1</script>']
+        for endpoint in endpoints:
+            with self.subTest(endpoint=endpoint):
+                expected = any(pattern.search(endpoint) for pattern in self.analyzer.attack_patterns)
+                self.assertEqual(bool(union.search(endpoint)), expected)
+        
+        # Backreferences would point at the wrong group once combined
+        self.assertIsNone(self.analyzer._compile_union(
+            self.analyzer._compile_patterns([r'(a)\1', r'/admin'])
+        ))
+    
+    def test_suspicious_subnet_matching(self):
+        """Test that suspicious IP entries match exact addresses and CIDR subnets."""
+        if not hasattr(self.analyzer, '_compile_ip_networks'):
+            self.skipTest("Subnet matching not available in mock analyzer")
+        
+        analyzer = SecurityAnalyzer(self.config)
+        analyzer.suspicious_ips = {'192.168.1.100', '10.0.0.0/8'}
+        analyzer.suspicious_nets, analyzer.suspicious_literals = \
+            analyzer._compile_ip_networks(analyzer.suspicious_ips)
+        logs = self.suspicious_logs.copy()
+        logs.loc[0, 'ip_address'] = '10.20.30.40'
+        
+        events = analyzer._detect_suspicious_ips(logs)
+        
+        flagged_ips = {event['ip_address'] for event in events}
+        self.assertEqual(flagged_ips, {'10.20.30.40', '192.168.1.100'})
+    
+    def test_suspicious_ip_entries_are_strict(self):
+        """Test that shorthand or malformed IP entries are ignored instead of reinterpreted."""
+        if not hasattr(self.analyzer, '_compile_ip_networks'):
+            self.skipTest("Subnet matching not available in mock analyzer")
+        
+        analyzer = SecurityAnalyzer(self.config)
+        entries = {'127.1', '010.0.0.1', '1.2.3.4 junk', '10', '10.0.0.0/33', '::1', '192.168.1.100'}
+        with self.assertLogs('src.analyzers.security', level='WARNING') as logs:
+            networks, literals = analyzer._compile_ip_networks(entries)
+        
+        self.assertEqual(len(logs.output), 5)
+        self.assertEqual(literals, {'::1'})
+        self.assertEqual([(mask, list(nets)) for mask, nets in networks], [(0xFFFFFFFF, [0xC0A80164])])
+    
     def test_analyze_empty_logs(self):
         """Test analyzing empty logs."""
         result = self.analyzer.analyze_logs(self.empty_logs)
@@ -2,21 +2,38 @@
 Unit tests for the utility helper functions.
 """
 import unittest
+import copy
 import os
+import secrets
 import logging
 import tempfile
 import yaml
 from pathlib import Path
 from unittest.mock import patch, MagicMock
+from src.utils.helpers import iter_lines, load_config
+
+# Prefer the libyaml C loader when PyYAML was built with it
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed YAML keyed on (absolute path, mtime, size) so unchanged files are parsed once
+_cfg_cache = {}
 
 # Create mock versions of the helper functions for testing
 def mock_load_config(config_path):
     """Mock implementation of load_config for testing."""
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Config file not found: {config_path}")
-        
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    
+    st = os.stat(config_path)
+    key = (os.path.abspath(config_path), st.st_mtime_ns, st.st_size)
+    cfg = _cfg_cache.get(key)
+    if cfg is None:
+        with open(config_path, 'rb') as f:
+            cfg = yaml.load(f, Loader=_Loader)
+        _cfg_cache[key] = cfg
+    
+    # Hand out a copy so callers can't mutate the cached entry
+    return copy.deepcopy(cfg)
 
 def mock_ensure_dir_exists(dir_path):
     """Mock implementation of ensure_dir_exists for testing."""
@@ -27,14 +44,20 @@ def mock_get_log_files(log_dir, extensions=None):
     """Mock implementation of get_log_files for testing."""
     if extensions is None:
         extensions = ['.log']
-        
-    log_files = []
-    for root, _, files in os.walk(log_dir):
-        for file in files:
-            if any(file.endswith(ext) for ext in extensions):
-                log_files.append(os.path.join(root, file))
     
-    return log_files
+    # A tuple lets str.endswith check every extension in one call
+    exts = tuple(extensions)
+    
+    def walk(directory):
+        # scandir reuses the file type from readdir instead of stat-ing each entry
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from walk(entry.path)
+                elif entry.name.endswith(exts):
+                    yield entry.path
+    
+    return list(walk(log_dir))
 
 def mock_setup_logging(log_file=None, log_level=logging.INFO):
     """Mock implementation of setup_logging for testing."""
@@ -57,10 +80,36 @@ def mock_setup_logging(log_file=None, log_level=logging.INFO):
     
     return logger
 
+class _IdPool:
+    """Hand out hex IDs sliced from one batched CSPRNG draw."""
+    
+    def __init__(self, length, batch=4096):
+        """Initialize a pool of IDs that are `length` hex characters long."""
+        self.length = length
+        self.nbytes = (length + 1) // 2
+        self.batch = batch
+        self._buf = b''
+        self._off = 0
+    
+    def next(self):
+        """Return the next ID, refilling the pool with a single token_bytes call."""
+        if self._off + self.nbytes > len(self._buf):
+            self._buf = secrets.token_bytes(self.nbytes * self.batch)
+            self._off = 0
+        chunk = self._buf[self._off:self._off + self.nbytes]
+        self._off += self.nbytes
+        return chunk.hex()[:self.length]
+
+# One pool per requested ID length
+_id_pools = {}
+
 def mock_generate_random_id(length=8):
     """Mock implementation of generate_random_id for testing."""
-    # For testing, always return a predictable ID based on the length
-    return 'test_id_' + 'x' * length
+    pool = _id_pools.get(length)
+    if pool is None:
+        pool = _id_pools[length] = _IdPool(length)
+    # Keep the predictable prefix so tests can recognise mock IDs
+    return 'test_id_' + pool.next()
 
 class TestHelperFunctions(unittest.TestCase):
     """Test cases for the helper utility functions."""
@@ -129,6 +178,31 @@ class TestHelperFunctions(unittest.TestCase):
         self.assertEqual(config['test_section']['nested']['nested_key'], 'nested_value')
         self.assertEqual(config['list_section'], [1, 2, 3])
     
+    def test_load_config_cache(self):
+        """Test that cached configuration is isolated and refreshed when the file changes."""
+        first = load_config(str(self.config_path))
+        second = load_config(str(self.config_path))
+        
+        # Repeated loads of an unchanged file are equal but independent copies
+        self.assertEqual(first, self.config_data)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first['test_section'], second['test_section'])
+        
+        # Mutating a returned config must not leak into the cache
+        first['test_section']['test_key'] = 'mutated'
+        first['list_section'].append(4)
+        config = load_config(str(self.config_path))
+        self.assertEqual(config, self.config_data)
+        
+        # Rewriting the file (new size and mtime) must invalidate the cached entry
+        self.config_data['test_section']['test_key'] = 'updated_value'
+        with open(self.config_path, 'w') as f:
+            yaml.dump(self.config_data, f)
+        
+        config = load_config(str(self.config_path))
+        self.assertEqual(config['test_section']['test_key'], 'updated_value')
+    
     def test_load_config_nonexistent_file(self):
         """Test loading configuration from a nonexistent file."""
         # Try to load a nonexistent config file using mock function
@@ -236,6 +310,38 @@ class TestHelperFunctions(unittest.TestCase):
         custom_id = mock_generate_random_id(length=custom_length)
         self.assertTrue(custom_id.startswith('test_id_'))
         self.assertEqual(len(custom_id), len('test_id_') + custom_length)
+        
+        # IDs drawn from the same pool should not repeat
+        self.assertNotEqual(mock_generate_random_id(), mock_generate_random_id())
+    
+    def test_iter_lines(self):
+        """Test iterating over the lines of a log file."""
+        log_path = self.logs_dir / 'lines.log'
+        log_path.write_bytes(b'first\nsecond\r\n\nlast')
+        
+        self.assertEqual(list(iter_lines(str(log_path))), ['first', 'second\r', '', 'last'])
+        
+        # An empty file yields nothing
+        empty_path = self.logs_dir / 'empty.log'
+        empty_path.write_bytes(b'')
+        self.assertEqual(list(iter_lines(str(empty_path))), [])
+    
+    def test_iter_lines_truncated_during_iteration(self):
+        """Test that truncating a file mid-scan ends the iteration cleanly."""
+        log_path = self.logs_dir / 'rotated.log'
+        line = b'192.168.1.1 - - [10/Oct/2023:13:55:36 -0700] "GET / HTTP/1.1" 200 2326\n'
+        total = (4 << 20) // len(line)
+        log_path.write_bytes(line * total)
+        
+        lines = iter_lines(str(log_path))
+        for _ in range(10):
+            next(lines)
+        
+        # Simulate logrotate copytruncate while the reader is still open
+        os.truncate(log_path, 0)
+        remaining = list(lines)
+        
+        self.assertLess(10 + len(remaining), total)
 
 if __name__ == '__main__':
     unittest.main()
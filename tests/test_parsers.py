@@ -3,9 +3,12 @@ Unit tests for the log parsers module.
 """
 import unittest
 import os
+import tempfile
+import types
+import pandas as pd
 from datetime import datetime
 from pathlib import Path
-from src.parsers.apache_parser import ApacheLogParser
+from src.parsers.apache_parser import ApacheLogParser, _parse_access_fast, _cached_ts, _cached_error_ts, _chunk_offsets
 
 class TestApacheLogParser(unittest.TestCase):
     """Test cases for the Apache log parser."""
@@ -82,6 +85,208 @@ class TestApacheLogParser(unittest.TestCase):
         self.assertEqual(result['message'], 'File does not exist: /var/www/html/favicon.ico')
         self.assertIsInstance(result['timestamp'], datetime)
     
+    def test_access_timestamp_rejects_non_digit_fields(self):
+        """Test that timestamp fields with spaces, underscores or signs are rejected."""
+        self.assertEqual(_cached_ts('10/Oct/2000:13:05:36 -0700'), datetime(2000, 10, 10, 13, 5, 36))
+        for value in ('10/Oct/2000:13:5 :36 -0700', '10/Oct/20_1:13:55:36 -0700', '10/Oct/2000:+3:55:36 -0700'):
+            with self.subTest(value=value):
+                self.assertIsNone(_cached_ts(value))
+    
+    def test_error_timestamp_rejects_non_digit_fields(self):
+        """Test that only the day of an error log timestamp may be space-padded."""
+        self.assertEqual(_cached_error_ts('Sun Oct  1 14:32:52 2023'), datetime(2023, 10, 1, 14, 32, 52))
+        for value in ('Wed Oct 11 1 :32:52 2023', 'Wed Oct 11 14:32:52 2_23', 'Wed Oct 11 14:-2:52 2023'):
+            with self.subTest(value=value):
+                self.assertIsNone(_cached_error_ts(value))
+    
+    def test_line_cache_returns_independent_copies(self):
+        """Test that cached access lines parse the same and can be modified safely."""
+        parser = ApacheLogParser(line_cache=True)
+        
+        first = parser.parse_line(self.combined_log_line)
+        first['endpoint'] = '/changed'
+        second = parser.parse_line(self.combined_log_line)
+        
+        self.assertEqual(second, self.parser.parse_line(self.combined_log_line))
+        self.assertEqual(len(parser._line_cache), 1)
+        self.assertIsNone(parser.parse_line(self.invalid_log_line))
+        self.assertEqual(len(parser._line_cache), 1)
+    
+    def test_specialized_parser_matches_general(self):
+        """Test that specializing for a detected format does not change parse results."""
+        lines = [
+            self.common_log_line,
+            self.combined_log_line,
+            self.combined_time_log_line,
+            self.invalid_log_line
+        ]
+        expected = [self.parser.parse_line(line) for line in lines]
+        
+        for log_format in ('common', 'combined', 'combined_time', 'error'):
+            with self.subTest(log_format=log_format):
+                parser = ApacheLogParser()
+                parser.specialize(log_format)
+                self.assertEqual([parser.parse_line(line) for line in lines], expected)
+    
+    def test_fast_access_parser_matches_regex(self):
+        """Test that the split-based access parser agrees with the regex patterns."""
+        lines = [
+            self.common_log_line,
+            self.combined_log_line,
+            self.combined_time_log_line,
+            '10.0.0.1 - - [10/Oct/2023:13:55:36 -0700] "POST /api HTTP/1.1 extra" 500 -',
+            '10.0.0.1 - - [10/Oct/2023:13:55:36 -0700] "GET /a HTTP/1.1" 200 12 "-" "Agent \\"quoted\\""',
+            '10.0.0.1 - - [10/Oct/2023:13:55:36 -0700] "GET /a HTTP/1.1" 200 12 "-" "-" 0.5 trailing'
+        ]
+        
+        for line in lines:
+            with self.subTest(line=line):
+                expected = None
+                for format_name in ('combined_time', 'combined', 'common'):
+                    match = self.parser.compiled_patterns[format_name].match(line)
+                    if match:
+                        expected = (format_name, match.groupdict())
+                        break
+                
+                # The fast parser may decline a line, but must never disagree with the regexes
+                result = _parse_access_fast(line)
+                if result is not None:
+                    self.assertEqual(result, expected)
+        
+        # The standard layouts should all be handled without the regexes
+        for line in lines[:3]:
+            self.assertIsNotNone(_parse_access_fast(line))
+    
+    def test_parse_file_streams_entries(self):
+        """Test that parse_file lazily yields the parseable entries of a file."""
+        lines = [
+            self.common_log_line,
+            self.invalid_log_line,
+            self.combined_log_line,
+            '',
+            self.combined_time_log_line
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, 'access.log')
+            with open(log_path, 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+            
+            entries = self.parser.parse_file(log_path)
+            self.assertIsInstance(entries, types.GeneratorType)
+            
+            count = 0
+            for entry, expected_format in zip(entries, ['common', 'combined', 'combined_time']):
+                self.assertEqual(entry['log_format'], expected_format)
+                count += 1
+            self.assertEqual(count, 3)
+            self.assertIsNone(next(entries, None))
+    
+    def test_parse_file_decodes_like_main_loop(self):
+        """Test that every file parsing path decodes non-ASCII lines as UTF-8."""
+        line = '10.0.0.1 - - [10/Oct/2023:13:55:36 -0700] "GET /caf\u00e9 HTTP/1.1" 200 12'
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, 'access.log')
+            with open(log_path, 'wb') as f:
+                f.write((line + '\n').encode('utf-8') * 2 + b'\xff' + (line + '\n').encode('utf-8'))
+            
+            entries = list(self.parser.parse_file(log_path))
+            parallel = self.parser.parse_file_parallel(log_path, workers=2)
+            bulk = self.parser.parse_file_bulk(log_path)
+        
+        self.assertEqual([entry['endpoint'] for entry in entries], ['/caf\u00e9'] * 3)
+        self.assertEqual(parallel, entries)
+        self.assertEqual(list(bulk['endpoint']), ['/caf\u00e9'] * 3)
+    
+    def test_parse_file_parallel_matches_parse_file(self):
+        """Test that parsing in worker processes returns the same entries in order."""
+        lines = [
+            self.common_log_line.replace('/index.html', f'/page{i}.html') if i % 3 else self.invalid_log_line
+            for i in range(300)
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, 'access.log')
+            with open(log_path, 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+            
+            expected = list(self.parser.parse_file(log_path))
+            result = self.parser.parse_file_parallel(log_path, workers=3)
+        
+        self.assertEqual(len(result), 200)
+        self.assertEqual(result, expected)
+    
+    def test_chunk_offsets_split_on_line_boundaries(self):
+        """Test that parallel chunks cover the whole file and end on newlines."""
+        data = ('\n'.join(f'line {i}' * (i % 7 + 1) for i in range(200)) + '\nno newline').encode()
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, 'access.log')
+            with open(log_path, 'wb') as f:
+                f.write(data)
+            
+            ranges = _chunk_offsets(log_path, 4)
+        
+        self.assertEqual(len(ranges), 4)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[end - 1:end], b'\n')
+    
+    def test_parse_file_parallel_keeps_parser_configuration(self):
+        """Test that worker processes use the caller's patterns and specialized format."""
+        patterns = dict(self.parser.patterns)
+        patterns['combined_with_time'] = patterns['combined_with_time'].replace(
+            r'^(?P<ip_address>\S+) \S+', r'^(?P<ip_address>\S+) (?P<ident>\S+)', 1
+        )
+        parser = ApacheLogParser(patterns=patterns)
+        parser.specialize('combined_time')
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, 'access.log')
+            with open(log_path, 'w') as f:
+                f.write('\n'.join([self.combined_time_log_line] * 20) + '\n')
+            
+            expected = list(parser.parse_file(log_path))
+            result = parser.parse_file_parallel(log_path, workers=2)
+        
+        self.assertEqual(expected[0]['ident'], '-')
+        self.assertEqual(result, expected)
+    
+    def test_parse_file_bulk_matches_parse_line(self):
+        """Test that bulk parsing a file keeps the same entries as parse_line."""
+        prefix = '10.0.0.1 - - [10/Oct/2023:13:55:36 -0700] "GET /a HTTP/1.1" 200 12'
+        lines = [
+            self.common_log_line,
+            self.combined_log_line,
+            self.combined_time_log_line,
+            self.invalid_log_line,
+            '10.0.0.1 - - [10/Oct/2023:13:55:36 -0700] "POST /api HTTP/1.1" 500 -',
+            prefix + ' "-" "-" 0.5 extra',
+            prefix + ' extra',
+            prefix + ' "" ""',
+            prefix + ' "-" "Agent \\"quoted\\""',
+            '10.0.0.1 - - [10/Oct/2023:13:55:36 -0700] "GET /unbalanced HTTP/1.1 200 12'
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, 'access.log')
+            with open(log_path, 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+            
+            logs_df = self.parser.parse_file_bulk(log_path)
+        
+        expected = [entry for entry in map(self.parser.parse_line, lines) if entry]
+        
+        # Fields a line does not have come back as NaN in the DataFrame
+        rows = [
+            {key: value for key, value in row.items() if not pd.isna(value)}
+            for row in logs_df.to_dict(orient='records')
+        ]
+        self.assertEqual(rows, expected)
+    
     def test_parse_invalid_log_line(self):
         """Test parsing an invalid log line."""
         result = self.parser.parse_line(self.invalid_log_line)
@@ -105,6 +310,25 @@ class TestApacheLogParser(unittest.TestCase):
         else:
             self.skipTest(f"Sample log file not found: {sample_log_path}")
     
+    def test_detect_format_cached_until_file_changes(self):
+        """Test that detected formats are reused until the file is modified."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, 'access.log')
+            with open(log_path, 'w') as f:
+                f.write(self.common_log_line + '\n')
+            
+            self.assertEqual(self.parser.detect_format(log_path), 'common')
+            self.assertEqual(len(self.parser._format_cache), 1)
+            self.assertEqual(self.parser.detect_format(log_path), 'common')
+            self.assertEqual(len(self.parser._format_cache), 1)
+            
+            # A rewritten file has a new size, so it is sniffed again
+            with open(log_path, 'w') as f:
+                f.write(self.combined_log_line + '\n')
+            
+            self.assertEqual(self.parser.detect_format(log_path), 'combined')
+            self.assertEqual(len(self.parser._format_cache), 2)
+    
     def test_detect_format_nonexistent_file(self):
         """Test detecting the format of a nonexistent file."""
         nonexistent_file = "nonexistent_file.log"
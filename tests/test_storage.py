@@ -6,8 +6,16 @@ import os
 import sqlite3
 import tempfile
 import pandas as pd
+from array import array
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+
+# The real database is only needed for the bulk insert integration test
+try:
+    from src.storage.database import LogDatabase
+except ImportError:
+    LogDatabase = None
 
 # Mock database class for testing
 class MockLogDatabase:
@@ -19,11 +27,26 @@ class MockLogDatabase:
         self.is_connected = True
         # Keep track of stored data
         self.stored_data = {
-            'access_logs': [],
             'error_logs': [],
             'performance_metrics': [],
             'security_events': []
         }
+        # Access logs are stored column-wise, with numeric columns packed into typed arrays
+        self.access_cols = {
+            'timestamp': [],
+            'ip_address': [],
+            'method': [],
+            'endpoint': [],
+            'status': array('i'),
+            'bytes_sent': array('q'),
+            'referrer': [],
+            'user_agent': [],
+            'response_time': array('d'),
+            'log_format': [],
+            'log_type': []
+        }
+        # Severity level of every stored security event, encoded once at ingest
+        self._sev = array('b')
     
     def close(self):
         """Mock closing the database connection."""
@@ -34,7 +57,10 @@ class MockLogDatabase:
         if not self.is_connected:
             return False
         
-        self.stored_data['access_logs'].extend(logs)
+        # Numeric columns default to zero so the typed arrays stay aligned
+        for column, values in self.access_cols.items():
+            default = 0 if isinstance(values, array) else None
+            values.extend(log.get(column, default) for log in logs)
         return True
     
     def store_error_logs(self, logs, source_file):
@@ -59,6 +85,7 @@ class MockLogDatabase:
             return False
         
         self.stored_data['security_events'].extend(events)
+        self._sev.extend(self._severity_level(event['severity']) for event in events)
         return True
     
     def query_access_logs(self, start_time=None, end_time=None, filters=None):
@@ -66,8 +93,9 @@ class MockLogDatabase:
         if not self.is_connected:
             return []
         
-        # Just return all stored logs for simplicity in tests
-        return self.stored_data['access_logs']
+        # Just return all stored logs for simplicity in tests, reassembled row by row
+        columns = list(self.access_cols)
+        return [dict(zip(columns, row)) for row in zip(*self.access_cols.values())]
     
     def query_security_events(self, start_time=None, end_time=None, min_severity=None):
         """Mock querying security events."""
@@ -75,9 +103,10 @@ class MockLogDatabase:
             return []
         
         if min_severity:
-            # Filter by severity
-            return [event for event in self.stored_data['security_events'] 
-                    if self._severity_level(event['severity']) >= self._severity_level(min_severity)]
+            # Filter by the precomputed severity levels
+            threshold = self._severity_level(min_severity)
+            return [event for event, sev in zip(self.stored_data['security_events'], self._sev)
+                    if sev >= threshold]
         else:
             return self.stored_data['security_events']
     
@@ -91,11 +120,11 @@ class MockLogDatabase:
         if not self.is_connected:
             return {}
         
-        # Calculate total bytes sent
-        total_bytes = sum(log.get('bytes_sent', 0) for log in self.stored_data['access_logs'])
+        # Calculate total bytes sent from the packed column
+        total_bytes = sum(self.access_cols['bytes_sent'])
         
         return {
-            'access_logs_count': len(self.stored_data['access_logs']),
+            'access_logs_count': len(self.access_cols['status']),
             'error_logs_count': len(self.stored_data['error_logs']),
             'performance_metrics_count': len(self.stored_data['performance_metrics']),
             'security_events_count': len(self.stored_data['security_events']),
@@ -103,6 +132,75 @@ class MockLogDatabase:
         }
 
 
+# Sample rows shared by every test, built once and frozen; setUp hands each
+# test its own shallow copies so mutations stay isolated
+_ACCESS_LOGS = tuple(MappingProxyType(row) for row in (
+    {
+        'timestamp': datetime(2023, 10, 10, 13, 55, 36),
+        'ip_address': '192.168.1.1',
+        'method': 'GET',
+        'endpoint': '/index.html',
+        'status': 200,
+        'bytes_sent': 1024,
+        'referrer': 'http://example.com',
+        'user_agent': 'Mozilla/5.0',
+        'response_time': 0.1,
+        'log_format': 'combined_time',
+        'log_type': 'access'
+    },
+    {
+        'timestamp': datetime(2023, 10, 10, 13, 56, 30),
+        'ip_address': '192.168.1.2',
+        'method': 'POST',
+        'endpoint': '/api/data',
+        'status': 201,
+        'bytes_sent': 512,
+        'referrer': 'http://example.com/form',
+        'user_agent': 'Mozilla/5.0',
+        'response_time': 0.3,
+        'log_format': 'combined_time',
+        'log_type': 'access'
+    }
+))
+
+_ERROR_LOGS = tuple(MappingProxyType(row) for row in (
+    {
+        'timestamp': datetime(2023, 10, 10, 14, 30, 15),
+        'module': 'error',
+        'client': '192.168.1.1',
+        'message': 'File does not exist: /var/www/html/favicon.ico',
+        'log_type': 'error'
+    },
+))
+
+_PERFORMANCE_METRICS = tuple(MappingProxyType(row) for row in (
+    {
+        'timestamp': '2023-10-10T14:00:00',
+        'metric_name': 'response_time',
+        'metric_value': 0.15,
+        'endpoint': '/index.html',
+        'time_window': 3600
+    },
+    {
+        'timestamp': '2023-10-10T14:00:00',
+        'metric_name': 'error_rate',
+        'metric_value': 0.05,
+        'endpoint': '/api/data',
+        'time_window': 3600
+    }
+))
+
+_SECURITY_EVENTS = tuple(MappingProxyType(row) for row in (
+    {
+        'timestamp': datetime(2023, 10, 10, 13, 58, 20),
+        'event_type': 'attack_pattern',
+        'severity': 'high',
+        'ip_address': '192.168.1.100',
+        'endpoint': '/admin/login.php',
+        'description': 'Potential admin page access attempt'
+    },
+))
+
 class TestLogDatabase(unittest.TestCase):
     """Test cases for the Log Database."""
     
@@ -123,72 +221,10 @@ class TestLogDatabase(unittest.TestCase):
         self.db = MockLogDatabase(self.db_path)
         
         # Sample log data
-        self.access_logs = [
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 55, 36),
-                'ip_address': '192.168.1.1',
-                'method': 'GET',
-                'endpoint': '/index.html',
-                'status': 200,
-                'bytes_sent': 1024,
-                'referrer': 'http://example.com',
-                'user_agent': 'Mozilla/5.0',
-                'response_time': 0.1,
-                'log_format': 'combined_time',
-                'log_type': 'access'
-            },
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 56, 30),
-                'ip_address': '192.168.1.2',
-                'method': 'POST',
-                'endpoint': '/api/data',
-                'status': 201,
-                'bytes_sent': 512,
-                'referrer': 'http://example.com/form',
-                'user_agent': 'Mozilla/5.0',
-                'response_time': 0.3,
-                'log_format': 'combined_time',
-                'log_type': 'access'
-            }
-        ]
-        
-        self.error_logs = [
-            {
-                'timestamp': datetime(2023, 10, 10, 14, 30, 15),
-                'module': 'error',
-                'client': '192.168.1.1',
-                'message': 'File does not exist: /var/www/html/favicon.ico',
-                'log_type': 'error'
-            }
-        ]
-        
-        self.performance_metrics = [
-            {
-                'timestamp': '2023-10-10T14:00:00',
-                'metric_name': 'response_time',
-                'metric_value': 0.15,
-                'endpoint': '/index.html',
-                'time_window': 3600
-            },
-            {
-                'timestamp': '2023-10-10T14:00:00',
-                'metric_name': 'error_rate',
-                'metric_value': 0.05,
-                'endpoint': '/api/data',
-                'time_window': 3600
-            }
-        ]
-        
-        self.security_events = [
-            {
-                'timestamp': datetime(2023, 10, 10, 13, 58, 20),
-                'event_type': 'attack_pattern',
-                'severity': 'high',
-                'ip_address': '192.168.1.100',
-                'endpoint': '/admin/login.php',
-                'description': 'Potential admin page access attempt'
-            }
-        ]
+        self.access_logs = [dict(row) for row in _ACCESS_LOGS]
+        self.error_logs = [dict(row) for row in _ERROR_LOGS]
+        self.performance_metrics = [dict(row) for row in _PERFORMANCE_METRICS]
+        self.security_events = [dict(row) for row in _SECURITY_EVENTS]
     
     def tearDown(self):
         """Clean up after the tests."""
@@ -204,7 +240,7 @@ class TestLogDatabase(unittest.TestCase):
         self.assertTrue(result)
         
         # Check that both logs were stored
-        self.assertEqual(len(self.db.stored_data['access_logs']), 2)
+        self.assertEqual(len(self.db.access_cols['status']), 2)
     
     def test_store_error_logs(self):
         """Test storing error logs in the database."""
@@ -294,5 +330,49 @@ class TestLogDatabase(unittest.TestCase):
         # Should return False indicating failure
         self.assertFalse(result)
 
+
+class TestLogDatabaseBulkInsert(unittest.TestCase):
+    """Integration test for bulk inserts through the real Log Database."""
+    
+    ROW_COUNT = 100000
+    
+    def setUp(self):
+        """Set up a real database in a temporary directory."""
+        if LogDatabase is None:
+            self.skipTest("LogDatabase not available")
+        
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = LogDatabase(os.path.join(self.temp_dir.name, "bulk_logs.db"))
+    
+    def tearDown(self):
+        """Clean up after the tests."""
+        self.db.close()
+        self.temp_dir.cleanup()
+    
+    def test_store_many_access_logs(self):
+        """Test that a large batch of access logs is inserted in one call."""
+        log = {
+            'timestamp': datetime(2023, 10, 10, 13, 55, 36),
+            'ip_address': '192.168.1.1',
+            'method': 'GET',
+            'endpoint': '/index.html',
+            'protocol': 'HTTP/1.1',
+            'status': 200,
+            'bytes_sent': 1024,
+            'referer': 'http://example.com',
+            'user_agent': 'Mozilla/5.0',
+            'response_time': 0.1,
+            'log_format': 'combined_time',
+            'log_type': 'access'
+        }
+        
+        count = self.db.store_access_logs([log] * self.ROW_COUNT, source_file='bulk.log')
+        
+        self.assertEqual(count, self.ROW_COUNT)
+        stored = self.db.conn.execute(
+            "SELECT COUNT(*), MIN(timestamp), SUM(bytes_sent) FROM access_logs WHERE source_file = 'bulk.log'"
+        ).fetchone()
+        self.assertEqual(tuple(stored), (self.ROW_COUNT, '2023-10-10 13:55:36', 1024 * self.ROW_COUNT))
+
 if __name__ == '__main__':
     unittest.main()